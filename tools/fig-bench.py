@@ -0,0 +1,26 @@
+#!/usr/bin/python3
+#
+# Figure Benchmark: times figure generation of all books
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+import sys
+
+from fig import bench, loader, registry
+
+if __name__ == '__main__':
+	p = bench.parser ('Benchmark figure generation of all books')
+	p.add_argument ('paths', nargs = '*', metavar = 'source',
+			help = 'figure generators or tables to time (default: all)')
+	args = p.parse_args ()
+
+	try:
+		for path in args.paths or loader.sources ():
+			loader.load (path)
+	except ValueError as e:
+		sys.exit (f'error: {e}')
+
+	sys.exit (bench.run (registry.books, args))
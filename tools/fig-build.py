@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+#
+# Figure Builder: renders figures of all books in one process
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+import sys
+
+from fig import build, loader, registry, watch
+
+if __name__ == '__main__':
+	p = build.parser ('Render figures of all books')
+	p.add_argument ('paths', nargs = '*', metavar = 'source',
+			help = 'figure generators or tables to build (default: all)')
+	p.add_argument ('-w', '--watch', action = 'store_true',
+			help = 'watch sources and render changed figures again')
+	args = p.parse_args ()
+
+	if args.watch:
+		sys.exit (watch.run (args.paths or loader.sources (), args))
+
+	try:
+		for path in args.paths or loader.sources ():
+			loader.load (path)
+	except ValueError as e:
+		sys.exit (f'error: {e}')
+
+	sys.exit (build.run (registry.books, args))
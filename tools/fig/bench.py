@@ -0,0 +1,227 @@
+#
+# Figure Benchmark: build timings compared against a saved baseline
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Figures are rendered and encoded in memory, nothing is written next to
+# them. Cold build starts with empty engine caches (font faces, surface
+# pool, text extents, frames), warm build follows it with caches left as
+# they are. Warm and primitive timings are the best of several runs.
+#
+
+import argparse, json, os, resource, sys, timeit
+
+from time import perf_counter
+
+from . import cache, engine, raster
+from .build import preflight, render_options
+from .engine import create, encode, release, ticks, bfls, text
+
+def clear ():
+	for o in cache.caches:
+		o.clear ()
+
+	engine.faces.clear ()
+	engine.matrices.clear ()
+	engine.scaled.clear ()
+
+def render (fig, opts):
+	start = perf_counter ()
+
+	surface, c = create (*fig.canvas, font = fig.book.font)
+	fig.draw (c, *fig.args)
+	data = encode (surface, opts.png, opts.png_level, opts.png_filter)
+	release (surface, c)
+
+	return perf_counter () - start, len (data)
+
+def run_book (book, opts):
+	figs = list (book.figures.values ())
+
+	clear ()
+	cold = sum (render (fig, opts)[0] for fig in figs)
+
+	best = {fig.name: render (fig, opts) for fig in figs}
+
+	for i in range (1, opts.repeat):
+		for fig in figs:
+			t, size = render (fig, opts)
+			best[fig.name] = min (best[fig.name][0], t), size
+
+	return {
+		'cold':	cold,
+		'warm':	sum (t for t, size in best.values ()),
+		'bytes':	sum (size for t, size in best.values ()),
+		'figures':	{name: {'time': t, 'bytes': size}
+				 for name, (t, size) in best.items ()},
+	}
+
+#
+# Primitives are timed on a typical instruction encoding figure canvas,
+# the time is per call.
+#
+def run_primitives (opts):
+	prog   = 'l.....l.....l..ol'
+	nums   = 'x....xx....xx..x'
+	fields = (6, 'dst', 6, 'src', 3, '0', 1, '1')
+
+	surface, c = create (8, 32, 4.3, 11)
+
+	cases = {
+		'ticks':	lambda: ticks (c, 0, 1, prog, nums),
+		'bfls':		lambda: bfls  (c, 0, 1, fields),
+		'text':		lambda: text  (c, 0, 3.5, 'MOVe'),
+		'write':	lambda: encode (surface, opts.png, opts.png_level,
+						opts.png_filter),
+	}
+
+	o = {}
+
+	for name, f in cases.items ():
+		t = timeit.Timer (f)
+		n, total = t.autorange ()
+		o[name] = min ([total] + t.repeat (opts.repeat - 1, n)) / n
+
+	release (surface, c)
+	return o
+
+def measure (books, opts):
+	return {
+		'version':	engine.version,
+		'raster':	opts.raster,
+		'books':	{book.name: run_book (book, opts) for book in books},
+		'primitives':	run_primitives (opts),
+		'rss':		resource.getrusage (resource.RUSAGE_SELF).ru_maxrss,
+	}
+
+#
+# Flat view maps measure names to values and tells timings from sizes:
+# timings below the noise floor are never taken as regressions.
+#
+def flat (r):
+	o = {}
+
+	for name, b in r['books'].items ():
+		o[name + ' cold']  = b['cold'],  True
+		o[name + ' warm']  = b['warm'],  True
+		o[name + ' bytes'] = b['bytes'], False
+
+		for fig, f in b['figures'].items ():
+			o[f'{name}/{fig} time']  = f['time'],  True
+			o[f'{name}/{fig} bytes'] = f['bytes'], False
+
+	for name, t in r['primitives'].items ():
+		o[name + ' call'] = t, True
+
+	o['peak rss'] = r['rss'], False
+	return o
+
+def compare (old, new, tolerance, floor):
+	old, new = flat (old), flat (new)
+	o = []
+
+	for key, (v, timing) in new.items ():
+		if not key in old:
+			continue
+
+		base = old[key][0]
+
+		if base > 0 and v > base * (1 + tolerance) and \
+		   (not timing or v - base > floor):
+			o.append ((key, base, v))
+
+	return o
+
+def value (key, v):
+	if key.endswith ('call'):
+		return f'{v * 1e6:.1f} us'
+
+	if key.endswith ((' cold', ' warm', ' time')):
+		return f'{v * 1e3:.2f} ms'
+
+	if key == 'peak rss':
+		return f'{v} KiB'
+
+	return f'{v} bytes'
+
+def report (r, verbose = False):
+	for name, b in r['books'].items ():
+		print (f'{name}: {len (b["figures"])} figures, '
+		       f'cold {b["cold"] * 1e3:.1f} ms, warm {b["warm"] * 1e3:.1f} ms, '
+		       f'{b["bytes"]} bytes')
+
+		if verbose:
+			for fig, f in b['figures'].items ():
+				print (f'\t{fig}: {f["time"] * 1e3:.2f} ms, {f["bytes"]} bytes')
+
+	for name, t in r['primitives'].items ():
+		print (f'{name}: {t * 1e6:.1f} us per call')
+
+	print (f'peak RSS: {r["rss"]} KiB')
+
+def parser (description = 'Benchmark figure generation'):
+	p = argparse.ArgumentParser (description = description)
+
+	p.add_argument ('-b', '--baseline', default = 'fig-bench.json',
+			help = 'baseline file (default: fig-bench.json)')
+	p.add_argument ('-s', '--save', action = 'store_true',
+			help = 'save results as the new baseline')
+	p.add_argument ('-t', '--tolerance', type = float, default = 0.10,
+			help = 'allowed relative regression (default: 0.10)')
+	p.add_argument ('--floor', type = float, default = 0.0005,
+			help = 'timing difference in seconds always taken as '
+			       'noise (default: 0.0005)')
+	p.add_argument ('-r', '--repeat', type = int, default = 5,
+			help = 'number of warm runs (default: 5)')
+	p.add_argument ('-v', '--verbose', action = 'store_true',
+			help = 'report time and size of every figure')
+	render_options (p)
+	return p
+
+#
+# Returns 1 if any measure regressed beyond tolerance against the baseline,
+# missing baseline is not an error.
+#
+def run (books, args):
+	if args.raster == 'numpy' and not raster.available ():
+		print ('error: NumPy rasterizer needs NumPy', file = sys.stderr)
+		return 2
+
+	engine.rasterizer = args.raster
+
+	if not preflight (books, args):
+		return 2
+
+	r = measure (books, args)
+	report (r, args.verbose)
+
+	if args.save:
+		with open (args.baseline, 'w') as f:
+			json.dump (r, f, indent = '\t', sort_keys = True)
+			f.write ('\n')
+
+		return 0
+
+	if not os.path.exists (args.baseline):
+		return 0
+
+	with open (args.baseline) as f:
+		old = json.load (f)
+
+	if old.get ('version') != r['version']:
+		print (f'warning: baseline is for engine version {old.get ("version")}',
+		       file = sys.stderr)
+
+	if old.get ('raster', 'cairo') != r['raster']:
+		print (f'warning: baseline is for {old.get ("raster", "cairo")} rasterizer',
+		       file = sys.stderr)
+
+	regressions = compare (old, r, args.tolerance, args.floor)
+
+	for key, base, v in regressions:
+		print (f'regression: {key}: {value (key, base)} -> {value (key, v)} '
+		       f'(+{100 * (v / base - 1):.1f}%)', file = sys.stderr)
+
+	return 1 if regressions else 0
@@ -0,0 +1,429 @@
+#
+# Figure Builder: renders registered figures in a process pool
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+import argparse, fnmatch, hashlib, multiprocessing, os, sys
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+from . import cache, dedup, engine, manifest, profile, raster, registry, sprite, \
+	verify
+from .engine import create, document, encode, formats, ink, release, replay, store
+from .png import filters
+
+#
+# Outputs of a build are formats and scales of images
+#
+def targets (opts):
+	return [(fmt, scale) for fmt in opts.format
+		for scale in (opts.scale if fmt == 'png' else [1])]
+
+#
+# Single output is drawn on its target directly, several outputs are
+# replayed from a display list recorded once, thus figure layout runs once
+# per figure anyway. Cropped figure is replayed too: its box is known after
+# it is drawn. Surface of a failed figure is not returned to the
+# pool: its context may be left in any state. Returns record of figure
+# profile without call counts.
+#
+def direct (opts):
+	todo = targets (opts)
+
+	return len (todo) == 1 and todo[0][1] == 1 and opts.crop is None
+
+def render (fig, opts):
+	start = perf_counter ()
+	todo  = targets (opts)
+
+	if direct (opts):
+		fmt = todo[0][0]
+		surface, c = create (*fig.canvas, font = fig.book.font, target = fmt)
+		fig.draw (c, *fig.args)
+		layout = perf_counter ()
+
+		data = [(fig.output (fmt), encode (surface, opts.png, opts.png_level,
+						   opts.png_filter))]
+		release (surface, c)
+	else:
+		surface, c = create (*fig.canvas, font = fig.book.font, target = 'record',
+				     background = opts.crop is None)
+		fig.draw (c, *fig.args)
+		box = None if opts.crop is None else ink (surface, opts.crop)
+		layout = perf_counter ()
+
+		data = [(fig.output (fmt, scale),
+			 encode (replay (surface, fmt, scale, box), opts.png,
+				 opts.png_level, opts.png_filter))
+			for fmt, scale in todo]
+
+	done = perf_counter ()
+
+	for path, o in data:
+		store (path, o)
+
+	return {'figure': repr (fig), 'draw': fig.draw.__name__,
+		'layout': layout - start, 'encode': done - layout,
+		'bytes': sum (len (o) for path, o in data)}
+
+#
+# Job returns an error message (or None), cache statistics gathered while
+# rendering the figure and its profile record (or None). In verify mode a
+# mismatch is an error, and nothing is written but image of differences.
+#
+def job (key, opts):
+	before = cache.stats ()
+	calls  = Counter (profile.calls)
+
+	try:
+		if opts.verify:
+			verify.check (registry.lookup (key), opts)
+			record = None
+		else:
+			record = render (registry.lookup (key), opts)
+			record.update (profile.counts (calls))
+
+		e = None
+	except Exception as o:
+		record = None
+		e = f'{type (o).__name__}: {o}'
+
+		# streams of vector surfaces of the failed figure
+		engine.streams.clear ()
+
+	return e, cache.stats () - before, record
+
+def key (fig):
+	return fig.book.name, fig.name
+
+#
+# Workers are forked after all books are registered, thus only figure keys
+# and build options are sent to them, not figures with their drawing
+# functions.
+#
+def build (figs, opts, stats = None, records = None):
+	errors  = []
+	stats   = Counter () if stats is None else stats
+	records = [] if records is None else records
+
+	def done (fig, e, s, record):
+		stats.update (s)
+
+		if e is not None:
+			errors.append ((fig, e))
+
+		if record is not None:
+			records.append (record)
+
+	if opts.jobs == 1 or len (figs) < 2:
+		for fig in figs:
+			done (fig, *job (key (fig), opts))
+
+		return errors
+
+	ctx = multiprocessing.get_context ('fork')
+
+	with ProcessPoolExecutor (opts.jobs, mp_context = ctx) as pool:
+		todo = {pool.submit (job, key (fig), opts): fig for fig in figs}
+
+		for f in as_completed (todo):
+			try:
+				r = f.result ()
+			except Exception as o:
+				r = f'{type (o).__name__}: {o}', Counter (), None
+
+			done (todo[f], *r)
+
+	return errors
+
+#
+# All figures of a book are streamed into one multi-page PDF document in
+# a single pass, one page per figure in the order of registration.
+#
+def pages (book, path):
+	tmp     = path + '.tmp'
+	surface = document (tmp)
+
+	try:
+		for fig in book.figures.values ():
+			try:
+				s, c = create (*fig.canvas, font = book.font, target = surface)
+				fig.draw (c, *fig.args)
+				c.show_page ()
+			except Exception as o:
+				return fig, f'{type (o).__name__}: {o}'
+
+		surface.finish ()
+		os.replace (tmp, path)
+	finally:
+		if os.path.exists (tmp):
+			os.remove (tmp)
+
+def sprites (book, opts):
+	try:
+		sprite.sprites (book, opts)
+	except Exception as o:
+		return book.name, f'{type (o).__name__}: {o}'
+
+#
+# Book outputs depend on all figures of a book, digest of such an output
+# is a hash of digests of the figures.
+#
+def run_books (books, args, name, make, extra = ()):
+	errors = []
+
+	for book in books:
+		path = os.path.join (book.root, name)
+		h    = hashlib.sha256 ()
+
+		for fig in book.figures.values ():
+			h.update (manifest.digest (fig, extra).encode ())
+
+		hashes = {path: h.hexdigest ()}
+
+		if not manifest.stale (book, hashes, args.force):
+			continue
+
+		e = make (book, path)
+
+		if e is not None:
+			errors.append (e)
+
+		manifest.save (book, hashes, [] if e is None else [path])
+
+	return errors
+
+def run_pages (books, args):
+	return run_books (books, args, 'figures.pdf', pages)
+
+def run_sprites (books, args):
+	return run_books (books, args, 'fig-sprites.json',
+			  lambda book, path: sprites (book, args),
+			  (args.png, args.png_level, args.png_filter) + fill (args))
+
+def render_options (p):
+	p.add_argument ('--png', choices = ['cairo', 'compact'], default = 'cairo',
+			help = 'PNG encoder: 32-bit RGBA by cairo, or compact gray or '
+			       'palette PNG of the least depth (default: cairo)')
+	p.add_argument ('--png-level', type = int, choices = range (10), default = 9,
+			metavar = '0-9', help = 'zlib compression level (default: 9)')
+	p.add_argument ('--png-filter', choices = filters, default = 'auto',
+			help = 'PNG row filter (default: auto)')
+	p.add_argument ('--raster', choices = ['cairo', 'numpy'], default = 'cairo',
+			help = 'rasterizer of strokes on images: cairo, or NumPy '
+			       'for horizontal and vertical lines (default: cairo)')
+	p.add_argument ('--font-fallback', metavar = 'FAMILY',
+			help = 'font to use in place of fonts not installed '
+			       '(default: fail)')
+
+#
+# Resolves fonts of all books before rendering, returns False if any font
+# is missing
+#
+def preflight (books, args):
+	engine.fallback = args.font_fallback
+
+	try:
+		for name, family in engine.preflight (book.font for book in books):
+			print (f'warning: font {name!r} is not installed, using {family!r}',
+			       file = sys.stderr)
+	except engine.FontError as e:
+		print (f'error: {e}', file = sys.stderr)
+		return False
+
+	return True
+
+def positive (s):
+	n = int (s)
+
+	if n < 1:
+		raise argparse.ArgumentTypeError (f'{n} is not a positive number')
+
+	return n
+
+# formats of whole books
+book_formats = {'pdf-book': run_pages, 'sprites': run_sprites}
+
+def parser (description = 'Render figures'):
+	p = argparse.ArgumentParser (description = description)
+
+	p.add_argument ('-j', '--jobs', type = positive, default = os.cpu_count (),
+			help = 'number of parallel jobs (default: all cores)')
+	p.add_argument ('-f', '--force', action = 'store_true',
+			help = 'render figures even if their inputs did not change')
+	p.add_argument ('-F', '--format', choices = formats + list (book_formats),
+			action = 'append',
+			help = 'output format, may be repeated, pdf-book writes all '
+			       'figures of a book into figures.pdf, sprites packs '
+			       'them into fig-sprites-N.png images indexed by '
+			       'fig-sprites.json and fig-sprites.css (default: png)')
+	p.add_argument ('-s', '--scale', type = int, choices = range (1, 5),
+			action = 'append', metavar = '1-4',
+			help = 'scale of PNG images, may be repeated, image at scale '
+			       'N > 1 is written as fig-NAME@Nx.png (default: 1)')
+	render_options (p)
+	p.add_argument ('-c', '--crop', type = int, metavar = 'MARGIN',
+			help = 'crop figures to their ink extents with a margin '
+			       'in pixels (default: canvas size)')
+	p.add_argument ('--link', action = 'store_true',
+			help = 'replace images byte-identical to images of other '
+			       'figures with links to them')
+	p.add_argument ('--stats', action = 'store_true',
+			help = 'report engine cache statistics')
+	p.add_argument ('--profile', metavar = 'FILE',
+			help = 'count drawing calls and write time, size and call '
+			       'counts of every figure rendered into FILE, CSV if '
+			       'its name ends with .csv, JSON otherwise')
+	p.add_argument ('-o', '--only', action = 'append', metavar = 'PATTERN',
+			help = 'select figures which name, file name or book/name '
+			       'matches shell pattern, may be repeated')
+	p.add_argument ('-l', '--list', action = 'store_true',
+			help = 'list selected figures and exit')
+	p.add_argument ('--verify', action = 'store_true',
+			help = 'render all figures in memory and compare them with '
+			       'PNG images in the tree, write nothing')
+	p.add_argument ('--diff', metavar = 'DIR', default = 'fig-diff',
+			help = 'directory for images of differences found by '
+			       '--verify (default: fig-diff)')
+	return p
+
+#
+# Selects figures of books by name ('047-6-rorb'), file name ('fig-2-7') or
+# book and name ('mcp-1600-um/5-3-lit'), all figures without patterns.
+#
+def matches (fig, patterns):
+	names = [fig.name, 'fig-' + fig.name, repr (fig)]
+
+	return any (fnmatch.fnmatchcase (n, p) for p in patterns for n in names)
+
+def select (books, patterns = None):
+	return [fig for book in books for fig in book.figures.values ()
+		if not patterns or matches (fig, patterns)]
+
+# rasterizer is part of digests of images only if it is not cairo
+def fill (opts):
+	return () if opts.raster == 'cairo' else (('raster', opts.raster),)
+
+#
+# Scale and encoder options are part of PNG figure digest: switching them
+# encodes figures again. Figure is rendered if any of its outputs is stale.
+# Images linked by --link are not rendered unless image linked to is.
+#
+def extra (opts, fmt, scale):
+	crop = () if opts.crop is None else (('crop', opts.crop),)
+
+	if fmt != 'png':
+		return crop
+
+	return (opts.png, opts.png_level, opts.png_filter) + \
+	       (() if scale == 1 else (scale,)) + crop + fill (opts)
+
+def run_figures (books, args, stats, records):
+	figs, hashes = [], {}
+	selected = select (books, args.only)
+
+	for book in books:
+		outputs = {fig.output (fmt, scale): (fig, extra (args, fmt, scale))
+			   for fig in selected if fig.book is book
+			   for fmt, scale in targets (args)}
+		hashes[book] = {o: manifest.digest (fig, e)
+				for o, (fig, e) in outputs.items ()}
+		stale = set (manifest.stale (book, hashes[book], args.force))
+
+		# image linked to an image rendered again is not the same anymore
+		stale |= {o for o in outputs
+			  if os.path.islink (o) and os.path.realpath (o) in stale}
+
+		stale = {outputs[o][0] for o in stale}
+		figs += [fig for fig in selected if fig in stale]
+
+	errors = build (figs, args, stats, records)
+	failed = {fig.output (fmt, scale) for fig, e in errors
+		  for fmt, scale in targets (args)}
+
+	for book in books:
+		manifest.save (book, hashes[book], failed)
+
+	try:
+		dedup.run (books, targets (args), args.link)
+	except ValueError as e:
+		errors.append (('aliases', str (e)))
+
+	return errors
+
+def run (books, args):
+	stats, records = Counter (), []
+	engine.profiling = args.profile is not None
+
+	args.format = list (dict.fromkeys (args.format or ['png']))
+	args.scale  = sorted (set (args.scale or [1]))
+
+	if args.list:
+		for fig in select (books, args.only):
+			print (fig)
+
+		return 0
+
+	fmt = args.format[0]
+
+	if len (args.format) > 1 and any (o in book_formats for o in args.format):
+		print ('error: formats of whole books cannot be mixed with others',
+		       file = sys.stderr)
+		return 2
+
+	if args.verify and targets (args) != [('png', 1)]:
+		print ('error: only PNG figures at scale 1 can be verified',
+		       file = sys.stderr)
+		return 2
+
+	if args.only and fmt in book_formats:
+		print (f'error: figures of a book cannot be selected for {fmt}',
+		       file = sys.stderr)
+		return 2
+
+	if args.raster == 'numpy' and not raster.available ():
+		print ('error: NumPy rasterizer needs NumPy', file = sys.stderr)
+		return 2
+
+	# replayed outputs are painted from recordings, not stroked
+	if args.raster == 'numpy' and not direct (args):
+		print ('error: NumPy rasterizer draws only single PNG images at '
+		       'scale 1 without --crop', file = sys.stderr)
+		return 2
+
+	engine.rasterizer = args.raster
+
+	if not preflight (books, args):
+		return 2
+
+	if args.verify:
+		errors = build (select (books, args.only), args, stats)
+	elif fmt in book_formats:
+		errors = book_formats[fmt] (books, args)
+	else:
+		errors = run_figures (books, args, stats, records)
+
+	for fig, e in sorted (errors, key = lambda o: repr (o[0])):
+		print (f'error: {fig}: {e}', file = sys.stderr)
+
+	if args.stats:
+		for line in cache.report (stats):
+			print (line)
+
+	if args.profile is not None:
+		profile.dump (records, args.profile)
+
+		if args.stats:
+			for line in profile.report (records):
+				print (line)
+
+	return 1 if errors else 0
+
+def main (books = None):
+	args = parser ().parse_args ()
+	sys.exit (run (registry.books if books is None else books, args))
@@ -0,0 +1,95 @@
+#
+# Figure Engine Caches: bounded LRU caches with hit statistics
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+from collections import Counter, OrderedDict
+
+caches = []
+
+class LRU:
+	def __init__ (self, name, size = 4096):
+		self.name = name
+		self.size = size
+		self.data = OrderedDict ()
+
+		self.hits   = 0
+		self.misses = 0
+
+		caches.append (self)
+
+	def get (self, key, make):
+		if key in self.data:
+			self.hits += 1
+			self.data.move_to_end (key)
+			return self.data[key]
+
+		self.misses += 1
+		value = self.data[key] = make ()
+
+		if len (self.data) > self.size:
+			self.data.popitem (last = False)
+
+		return value
+
+	def clear (self):
+		self.data.clear ()
+
+#
+# Pool keeps up to size released objects per key for reuse
+#
+class Pool:
+	def __init__ (self, name, size = 4):
+		self.name = name
+		self.size = size
+		self.free = {}
+
+		self.hits   = 0
+		self.misses = 0
+
+		caches.append (self)
+
+	def get (self, key, make):
+		free = self.free.get (key)
+
+		if free:
+			self.hits += 1
+			return free.pop ()
+
+		self.misses += 1
+		return make ()
+
+	def put (self, key, value):
+		free = self.free.setdefault (key, [])
+
+		if len (free) < self.size:
+			free.append (value)
+
+	def clear (self):
+		self.free.clear ()
+
+def stats ():
+	o = Counter ()
+
+	for c in caches:
+		o[c.name + ' hits']   = c.hits
+		o[c.name + ' misses'] = c.misses
+
+	return o
+
+def report (stats):
+	lines = []
+
+	for c in caches:
+		hits   = stats[c.name + ' hits']
+		misses = stats[c.name + ' misses']
+		total  = hits + misses
+
+		if total > 0:
+			lines.append (f'{c.name}: {hits} hits, {misses} misses, '
+				      f'{100 * hits / total:.1f}% hit rate')
+
+	return lines
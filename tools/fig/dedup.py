@@ -0,0 +1,125 @@
+#
+# Figure Deduplication: aliases of figures with the same image
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Images are addressed by hash of their contents: an output with the same
+# bytes as output of a figure registered before it is an alias of that
+# output. Encoding is deterministic, thus images with the same pixels have
+# the same bytes if they are encoded with the same options. Aliases
+# declared with Book.alias () are never rendered, their outputs are links
+# to the outputs of the figures they stand for. Aliases of a book are
+# listed in fig-aliases.json next to its images.
+#
+
+import hashlib, json, os
+
+name = 'fig-aliases.json'
+
+def digest (path):
+	with open (path, 'rb') as f:
+		return hashlib.sha256 (f.read ()).hexdigest ()
+
+#
+# Replaces file with relative symbolic link to target, returns True if
+# the file was replaced.
+#
+def link (path, target):
+	rel = os.path.relpath (target, os.path.dirname (path))
+
+	if os.path.islink (path) and os.readlink (path) == rel:
+		return False
+
+	tmp = path + '.tmp'
+
+	if os.path.lexists (tmp):
+		os.remove (tmp)
+
+	os.symlink (rel, tmp)
+	os.replace (tmp, path)
+	return True
+
+#
+# Returns found and declared aliases of a book outputs: maps output path
+# of every alias to output path of the figure it stands for.
+#
+def aliases (book, fmt, scale = 1):
+	found, seen = {}, {}
+
+	for fig in book.figures.values ():
+		path = fig.output (fmt, scale)
+
+		if os.path.islink (path):
+			if os.path.exists (path):
+				found[path] = os.path.realpath (path)
+
+			continue
+
+		if not os.path.exists (path):
+			continue
+
+		h = digest (path)
+
+		if h in seen:
+			found[path] = seen[h]
+		else:
+			seen[h] = path
+
+	declared = {}
+
+	for alias, target in book.aliases.items ():
+		if not target in book.figures:
+			raise ValueError (f'{book.name}: {alias} is alias of unknown figure {target}')
+
+		path = book.figures[target].output (fmt, scale)
+		declared[book.output (alias, fmt, scale)] = found.get (path, path)
+
+	return found, declared
+
+def save (book, aliases):
+	path = os.path.join (book.root, name)
+	new  = {os.path.basename (o): os.path.basename (t) for o, t in aliases.items ()}
+
+	try:
+		with open (path) as f:
+			old = json.load (f)
+	except FileNotFoundError:
+		old = None
+
+	if not new:
+		if old is not None:
+			os.remove (path)
+
+		return
+
+	if new == old:
+		return
+
+	with open (path, 'w') as f:
+		json.dump (new, f, indent = '\t', sort_keys = True)
+		f.write ('\n')
+
+#
+# Declared aliases are always links, found ones become links on request.
+#
+def run (books, targets, links = False):
+	for book in books:
+		o = {}
+
+		for fmt, scale in targets:
+			found, declared = aliases (book, fmt, scale)
+
+			for path, target in declared.items ():
+				if os.path.exists (target):
+					link (path, target)
+
+			if links:
+				for path, target in found.items ():
+					link (path, target)
+
+			o.update (found)
+			o.update (declared)
+
+		save (book, o)
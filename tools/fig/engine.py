@@ -0,0 +1,628 @@
+#
+# Figure Engine: common drawing primitives for figure generators
+#
+# Copyright (c) 2021-2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+import io, math, os, subprocess
+
+from . import lazy, png, profile, raster
+from .cache import LRU, Pool
+
+# drawing primitives taken by figure generators with import *
+__all__ = [
+	'fonts', 'font_size', 'create', 'write',
+	'line', 'hline', 'vline', 'text', 'ctext', 'text_extents',
+	'H', 'ticks', 'bfl', 'bfls', 'desc', 'fields', 'register',
+]
+
+# cairo is imported on first use: loading and listing figures do not need it
+cairo = lazy.module ('cairo', globals ())
+
+version = 1		# bump on any change of rendered pixels
+
+fonts = ["Liberation Sans", "Cantarell", "Fontin Sans CR", "Latin Modern Sans"]
+
+#
+# Toy font face falls back to some default font silently, thus fonts are
+# resolved with fontconfig once before rendering: a missing font is an
+# error unless fallback font is given explicitly. Without fontconfig tools
+# fonts are taken as they are.
+#
+fallback = None
+resolved = {}
+
+class FontError (Exception):
+	pass
+
+def match (name):
+	try:
+		o = subprocess.run (['fc-match', '-f', '%{family}', name],
+				    capture_output = True, text = True, check = True)
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+	return [f.strip ().lower () for f in o.stdout.split (',')]
+
+def installed (name):
+	found = match (name)
+
+	return found is None or name.lower () in found
+
+def resolve (name):
+	if name in resolved:
+		return resolved[name]
+
+	if installed (name):
+		family = name
+	elif fallback is None:
+		raise FontError (f'font {name!r} is not installed')
+	elif not installed (fallback):
+		raise FontError (f'fallback font {fallback!r} is not installed')
+	else:
+		family = fallback
+
+	resolved[name] = family
+	return family
+
+#
+# Returns fonts substituted by fallback font
+#
+def preflight (names):
+	return [(name, resolve (name)) for name in sorted (set (names))
+		if resolve (name) != name]
+
+faces = {}
+
+def font_face (name):
+	if not name in faces:
+		faces[name] = cairo.ToyFontFace (resolved.get (name, name))
+
+	return faces[name]
+
+#
+# Labels are drawn at a few sizes only, thus font matrices are made once
+# per size, and scaled fonts once per face, size and transformation matrix
+# (without translation) of a context.
+#
+matrices = {}
+scaled   = {}
+
+def font_matrix (size, right = True):
+	if not (size, right) in matrices:
+		yy = -size if right else size
+		matrices[size, right] = cairo.Matrix (size, 0, 0, yy, 0, 0)
+
+	return matrices[size, right]
+
+def font_size (c, size, right = True):
+	face, m = c.get_font_face (), c.get_matrix ()
+	key = (face.get_family (), size, right, m.xx, m.yx, m.xy, m.yy)
+
+	if not key in scaled:
+		ctm = cairo.Matrix (m.xx, m.yx, m.xy, m.yy, 0, 0)
+		scaled[key] = cairo.ScaledFont (face, font_matrix (size, right), ctm,
+						cairo.FontOptions ())
+
+	c.set_scaled_font (scaled[key])
+
+#
+# With profiling on contexts count drawing calls, see profile.py. Strokes
+# on images are filled by NumPy with numpy rasterizer, see raster.py.
+#
+profiling  = False
+rasterizer = 'cairo'
+
+def context (surface):
+	c = cairo.Context (surface)
+
+	if rasterizer == 'numpy' and isinstance (surface, cairo.ImageSurface):
+		c = raster.Context (c)
+
+	return profile.Context (c) if profiling else c
+
+#
+# Most figures share the same geometry, thus image surfaces are taken from
+# a pool and returned to it with release () after write (). Initial state of
+# pooled context is saved in create () and restored in release (), and
+# background fill overwrites every pixel, so a reused surface is as good as
+# a new one.
+#
+surfaces = Pool ('surface pool')
+
+def image (IW, IH):
+	surface = cairo.ImageSurface (cairo.FORMAT_ARGB32, IW, IH)
+
+	return surface, context (surface)
+
+#
+# Vector surfaces write into memory streams, the stream is taken by write ()
+# after the surface is finished. Streams are keyed by surfaces themselves,
+# not by their ids: a surface left by a failed figure is kept with its
+# stream until the builder drops them, and its id cannot be taken by a new
+# one. One pixel of image maps to one point.
+#
+formats = ['png', 'svg', 'pdf']
+streams = {}
+
+def vector (IW, IH, target):
+	f = io.BytesIO ()
+
+	if target == 'svg':
+		surface = cairo.SVGSurface (f, IW, IH)
+	else:
+		surface = cairo.PDFSurface (f, IW, IH)
+
+	streams[surface] = f
+	return surface, context (surface)
+
+#
+# Recording surface keeps drawing of a figure as a display list to replay
+# it to any number of targets, at any scale for images.
+#
+def record (IW, IH):
+	surface = cairo.RecordingSurface (cairo.CONTENT_COLOR_ALPHA,
+					  cairo.Rectangle (0, 0, IW, IH))
+
+	return surface, context (surface)
+
+#
+# Box of ink extents of a recording and a margin around them in pixels,
+# box is aligned to pixels, so cropped figure has the same pixels.
+#
+def ink (recording, margin = 0):
+	x, y, w, h = recording.ink_extents ()
+
+	if w <= 0 or h <= 0:
+		x, y, w, h = recording.get_extents ()
+
+	x0, y0 = math.floor (x) - margin, math.floor (y) - margin
+	x1, y1 = math.ceil (x + w) + margin, math.ceil (y + h) + margin
+
+	return x0, y0, x1 - x0, y1 - y0
+
+#
+# Recording is replayed as is, or box of it on white background
+#
+def replay (recording, target, scale = 1, box = None):
+	x, y, IW, IH = recording.get_extents () if box is None else box
+
+	if target == 'png':
+		surface = cairo.ImageSurface (cairo.FORMAT_ARGB32,
+					      round (IW * scale), round (IH * scale))
+		c = context (surface)
+	else:
+		surface, c = vector (IW, IH, target)
+
+	c.scale (scale, scale)
+
+	if box is not None:
+		c.set_source_rgb (1.0, 1.0, 1.0)
+		c.paint ()
+
+	c.set_source_surface (recording, -x, -y)
+	c.paint ()
+
+	return surface
+
+def document (path):
+	return cairo.PDFSurface (path, 1, 1)
+
+#
+# Target is an output format name, 'record' or a PDF surface to draw the next page
+# of a multi-page document on.
+#
+def canvas (IW, IH, target):
+	if target == 'png':
+		return surfaces.get ((IW, IH), lambda: image (IW, IH))
+
+	if target in formats:
+		return vector (IW, IH, target)
+
+	if target == 'record':
+		return record (IW, IH)
+
+	target.set_size (IW, IH)
+	return target, context (target)
+
+#
+# Figure without background is drawn on a recording surface only: its ink
+# extents are the extents of the figure itself.
+#
+def create (M, W, H, S = 20, step = 1, grid = False, right = True, font = fonts[3],
+	    target = 'png', background = True):
+	SW, SH = round (W * S), round (H * S)
+	IW, IH = SW + M * 2 + 1, SH + M * 2 + 1
+
+	surface, c = canvas (IW, IH, target)
+	c.save ()
+
+	if right:
+		# use right-handed Cartesian coordinate system
+		c.scale (1.0, -1.0)
+		c.translate (0, -IH)
+
+	if background:
+		c.set_source_rgb (1.0, 1.0, 1.0)
+		c.rectangle (0, 0, IW, IH)
+		c.fill ()
+
+	# clip out margins
+	c.rectangle (M, M, SW + 1, SH + 1)
+	c.clip ()
+
+	# coordinates in center of pixels in user area
+	c.translate (M + 0.5, M + 0.5)
+
+	c.set_source_rgb (0.0, 0.0, 0.0)
+	c.set_line_width (1.0)
+
+	c.set_line_cap  (1)  # cairo.LineCap.ROUND
+	c.set_line_join (1)  # cairo.LineJoin.ROUND
+
+	if grid:
+		c.set_dash ([0, 4])
+
+		for i in range (0, SW + 1, S):
+			c.move_to (i,  0)
+			c.line_to (i, SH)
+			c.stroke ()
+
+		for j in range (0, SH + 1, S):
+			c.move_to (0,  j)
+			c.line_to (SW, j)
+			c.stroke ()
+
+		c.set_dash ([])
+
+	# scale to user coordinates
+	c.scale (S / step, S / step)
+	c.set_line_width (0.0625 * step)
+	c.set_font_face (font_face (font))
+	font_size (c, 0.5 * step)
+
+	return surface, c
+
+def store (path, data):
+	try:
+		with open (path, 'rb') as f:
+			if f.read () == data:
+				return False
+	except FileNotFoundError:
+		pass
+
+	# do not write through a link to the image of another figure
+	if os.path.islink (path):
+		os.remove (path)
+
+	with open (path, 'wb') as f:
+		f.write (data)
+
+	return True
+
+#
+# Compact encoder writes opaque gray images as gray or palette PNG of the
+# least depth, cairo writes anything else.
+#
+def encode (surface, encoder = 'cairo', level = 9, filter = 'auto'):
+	if surface in streams:
+		surface.finish ()
+		return streams.pop (surface).getvalue ()
+
+	if encoder == 'compact':
+		data = png.encode (surface, level, filter)
+
+		if data is not None:
+			return data
+
+	f = io.BytesIO ()
+	surface.write_to_png (f)
+
+	return f.getvalue ()
+
+def write (surface, path, encoder = 'cairo', level = 9, filter = 'auto'):
+	return store (path, encode (surface, encoder, level, filter))
+
+def release (surface, c):
+	if not isinstance (surface, cairo.ImageSurface):
+		return
+
+	c.new_path ()
+	c.restore ()
+
+	surfaces.put ((surface.get_width (), surface.get_height ()), (surface, c))
+
+def line (c, x0, y0, x1, y1):
+	c.move_to (x0, y0)
+	c.line_to (x1, y1)
+
+def hline (c, x0, y0, dx):
+	line (c, x0, y0, x0 + dx, y0)
+
+def vline (c, x0, y0, dy):
+	line (c, x0, y0, x0, y0 + dy)
+
+#
+# Text extents depend on font face, font matrix and transformation matrix
+# (without translation), the same labels repeat in nearly every figure.
+#
+extents = LRU ('text extents')
+
+def text_extents (c, label):
+	f, m = c.get_font_matrix (), c.get_matrix ()
+	key  = (c.get_font_face ().get_family (), f.xx, f.yx, f.xy, f.yy,
+		m.xx, m.yx, m.xy, m.yy, label)
+
+	return extents.get (key, lambda: c.text_extents (label))
+
+def text (c, x, y, label, align = 0.0):
+	label = str (label)
+	e = text_extents (c, label)
+	c.move_to (x - e.width * align, y)
+	c.show_text (label)
+
+def ctext (c, x, y, label):
+	text (c, x - 0.1, y, label, 0.5)
+
+# Word Format Diagrams
+
+H = 2		# word format diagram height
+
+def tick_len (tick):
+	if tick == 'l':  return H
+	if tick == 'o':  return H / 2.5
+	if tick == '.':  return H / 5
+
+	return 0
+
+def draw_ticks (c, x, y, prog, nums = None):
+	total = len (prog) - 1
+	dx = total * H
+
+	hline (c, x, y,     dx)
+	hline (c, x, y + H, dx)
+
+	X = x + dx
+
+	for a in prog:
+		h = tick_len (a)
+
+		if h > 0:
+			vline (c, X, y, h)
+
+		X -= H
+
+	c.stroke ()
+
+	if nums != None:
+		font_size (c, 0.75)
+		X = x + dx - H / 2
+
+		for i in range (0, total):
+			if nums[i] == 'x':
+				ctext (c, X, y - 1, i)
+
+			X -= H
+
+#
+# Frames of word format diagrams repeat from figure to figure, thus a frame
+# on a raster target without pending path is rendered once into a transparent
+# image with the same size, transform, clip and drawing state as the target,
+# and then composited onto every target with the same key. Pattern is painted
+# with identity transform, so its pixels map to target pixels one to one.
+# Frame is drawn by a function draw (c, *args), its arguments are the key.
+#
+frames = LRU ('frames', 64)
+
+def frame_key (c, draw, *args):
+	s = c.get_target ()
+	m = c.get_matrix ()
+	r = c.get_source ()
+
+	if c.has_current_point () or not isinstance (r, cairo.SolidPattern):
+		return None
+
+	try:
+		clip = tuple (tuple (o) for o in c.copy_clip_rectangle_list ())
+	except cairo.Error:
+		return None
+
+	return (s.get_width (), s.get_height (), m.xx, m.yx, m.xy, m.yy, m.x0, m.y0,
+		clip, r.get_rgba (), c.get_line_width (), c.get_line_cap (),
+		c.get_line_join (), c.get_font_face ().get_family (),
+		draw) + args
+
+def frame (c, draw, *args):
+	s = c.get_target ()
+	surface = cairo.ImageSurface (cairo.FORMAT_ARGB32, s.get_width (), s.get_height ())
+	f = context (surface)
+
+	f.set_matrix (c.get_matrix ())
+
+	for r in c.copy_clip_rectangle_list ():
+		f.rectangle (*r)
+
+	f.clip ()
+
+	f.set_source     (c.get_source ())
+	f.set_line_width (c.get_line_width ())
+	f.set_line_cap   (c.get_line_cap ())
+	f.set_line_join  (c.get_line_join ())
+	f.set_font_face  (c.get_font_face ())
+
+	draw (f, *args)
+	surface.flush ()
+
+	return cairo.SurfacePattern (surface)
+
+#
+# Returns True if the frame is painted from cache: drawing state set by
+# draw function is not set then.
+#
+def framed (c, draw, *args):
+	key = None
+
+	if isinstance (c.get_target (), cairo.ImageSurface):
+		key = frame_key (c, draw, *args)
+
+	if key is None:
+		draw (c, *args)
+		return False
+
+	pattern = frames.get (key, lambda: frame (c, draw, *args))
+
+	c.save ()
+	c.identity_matrix ()
+	c.set_source (pattern)
+	c.paint ()
+	c.restore ()
+	return True
+
+def ticks (c, x, y, prog, nums = None):
+	if framed (c, draw_ticks, x, y, prog, nums) and nums != None:
+		font_size (c, 0.75)
+
+def bfl (c, x, y, total, start, size, label):	# bit field label
+	font_size (c, 1)
+
+	x += (total - start - size / 2) * H
+	text (c, x, y + 0.64, label, 0.5)
+
+def bfls (c, x, y, prog):
+	cmds  = list (zip (prog[::2], prog[1::2]))
+	total = 0
+	start = 0
+
+	for size, label in cmds:
+		total += size
+
+	for size, label in cmds:
+		if label != None:
+			bfl (c, x, y, total, start, size, label)
+
+		start += size
+
+def desc (c, x, y, name, syntax, time):
+	font_size (c, 1)
+	y += H + 0.5
+
+	if name   != None:  text (c, x,          y, name)
+	if syntax != None:  text (c, x + H *  8, y, syntax, 0.5)
+	if time   != None:  text (c, x + H * 16, y, time,   1.0)
+
+# Register Diagrams
+
+#
+# Register diagram is a word of width bits, a unit per bit, drawn as rows
+# of height h from top to bottom. Row is a list of fields (size, label)
+# from the most significant bit and a note to the right of it. Bit numbers
+# of all field edges are put above the diagram, number of the low bit of a
+# field is padded to look aligned to the right.
+#
+def edges (width, rows, bits = ()):
+	o = {}
+
+	for sizes in rows:
+		end = 0
+
+		for size in sizes:
+			end += size
+			low  = width - end
+			o[end - 1] = f'  {low}' if low < 10 else str (low)
+
+	for sizes in rows:
+		start = 0
+
+		for size in sizes:
+			o[start] = str (width - 1 - start)
+			start += size
+
+	o.update (bits)
+	return o
+
+def draw_rows (c, x, y, width, rows, h, bits = ()):
+	n = len (rows)
+
+	for i in range (n + 1):
+		line (c, x, y + i * h, x + width, y + i * h)
+
+	# vertical lines of adjacent rows are joined
+	cuts = {}
+
+	for i, sizes in enumerate (rows):
+		X = 0
+
+		for size in (0,) + sizes:
+			X += size
+			cuts.setdefault (X, set ()).add (n - 1 - i)
+
+	for X, spans in cuts.items ():
+		for i in sorted (spans):
+			if i - 1 in spans:
+				continue
+
+			j = i
+
+			while j + 1 in spans:
+				j += 1
+
+			line (c, x + X, y + i * h, x + X, y + (j + 1) * h)
+
+	c.stroke ()
+
+	font_size (c, 0.75)
+
+	for X, label in sorted (edges (width, rows, bits).items ()):
+		text (c, x + X, y + n * h + 0.25, label)
+
+#
+# Draws rows of fields (size, label, offset) from top to bottom with a note
+# to the right of every row. Label is centered in its field unless offset
+# of its start in the field is given, bits maps bit positions (from the left)
+# to numbers shown there instead of the usual ones.
+#
+def register (c, x, y, width, rows, h = 2, bits = {}):
+	for fields, note in rows:
+		if sum (size for size, label, at in fields) != width:
+			raise ValueError (f'fields of row do not cover {width} bits')
+
+	sizes = tuple (tuple (size for size, label, at in fields) for fields, note in rows)
+	framed (c, draw_rows, x, y, width, sizes, h, tuple (sorted (bits.items ())))
+
+	font_size (c, 1)
+	Y = y + len (rows) * h
+
+	for fields, note in rows:
+		Y -= h
+		X  = x
+
+		for size, label, at in fields:
+			if label == None:
+				pass
+			elif at == None:
+				text (c, X + size / 2, Y + h / 2 - 0.36, label, 0.5)
+			else:
+				text (c, X + at, Y + h / 2 - 0.36, label)
+
+			X += size
+
+		if note != None:
+			text (c, x + width + 0.5, Y + h / 2 - 0.36, note)
+
+#
+# Fields of a row in text form: 'size label | size label @offset ...', label
+# '-' stands for no label.
+#
+def fields (spec):
+	o = []
+
+	for f in spec.split ('|'):
+		size, _, label = f.strip ().partition (' ')
+		label, _, at = label.partition ('@')
+		label = label.strip ()
+		o.append ((int (size), None if label in ('', '-') else label,
+			   float (at) if at.strip () else None))
+
+	return tuple (o)
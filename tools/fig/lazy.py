@@ -0,0 +1,30 @@
+#
+# Lazy Import: modules imported on first use
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+import importlib
+
+#
+# Module stands for a module in the scope (globals) of the importer, the
+# first attribute lookup imports the module and puts it in place of the
+# stand-in, so later lookups cost nothing extra.
+#
+class Module:
+	def __init__ (self, name, scope):
+		self.name  = name
+		self.scope = scope
+
+	def __getattr__ (self, attr):
+		module = importlib.import_module (self.name)
+
+		if self.scope.get (self.name) is self:
+			self.scope[self.name] = module
+
+		return getattr (module, attr)
+
+def module (name, scope):
+	return Module (name, scope)
@@ -0,0 +1,42 @@
+#
+# Figure Loader: finds and loads figure generators and tables of all books
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+import importlib.util, os
+
+from glob import glob
+
+from . import registry, table
+
+root = os.path.dirname (os.path.dirname (os.path.dirname (os.path.realpath (__file__))))
+
+#
+# A book is either a figure generator or a figure table alone, generator
+# loads tables from its directory by itself.
+#
+def sources ():
+	found = []
+
+	for top in ['doc', 'ic']:
+		for name in ['fig-gen.py', 'fig-spec.txt']:
+			found += glob (os.path.join (root, top, '**', name), recursive = True)
+
+	gens = {os.path.dirname (o) for o in found if o.endswith ('.py')}
+
+	return sorted (o for o in found
+		       if o.endswith ('.py') or not os.path.dirname (o) in gens)
+
+def load (path):
+	if not path.endswith ('.py'):
+		table.book (path)
+		return
+
+	name = 'fig-gen-' + str (len (registry.books))
+	spec = importlib.util.spec_from_file_location (name, path)
+	o    = importlib.util.module_from_spec (spec)
+
+	spec.loader.exec_module (o)
@@ -0,0 +1,82 @@
+#
+# Figure Manifest: input hashes of rendered figures
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+import hashlib, inspect, json, os
+
+from . import engine
+
+name = 'fig-manifest.json'
+
+#
+# Code fingerprint does not depend on line numbers, thus figures do not
+# become stale when unrelated lines are added above them.
+#
+def code (o):
+	consts = tuple (code (k) if inspect.iscode (k) else k for k in o.co_consts)
+
+	return o.co_code, o.co_names, consts
+
+#
+# Figure digest covers everything that affects its pixels: engine version,
+# font resolved, canvas geometry and scale, drawing function and its arguments, and
+# extra output options.
+#
+def digest (fig, extra = ()):
+	h = hashlib.sha256 ()
+
+	font = engine.resolved.get (fig.book.font, fig.book.font)
+
+	for o in [engine.version, font, fig.canvas, code (fig.draw.__code__),
+		  fig.args, extra]:
+		h.update (repr (o).encode ())
+		h.update (b'\0')
+
+	return h.hexdigest ()
+
+def path (book):
+	return os.path.join (book.root, name)
+
+def load (book):
+	try:
+		with open (path (book)) as f:
+			return json.load (f)
+	except FileNotFoundError:
+		return {}
+
+#
+# Manifest maps output file names to digests of their inputs, hashes passed
+# to stale () and save () map output paths to digests. Entries of outputs
+# not built this time are kept.
+#
+def save (book, hashes, failed = ()):
+	old = load (book)
+	new = dict (old)
+
+	for output, h in hashes.items ():
+		if output in failed:
+			new.pop (os.path.basename (output), None)
+		else:
+			new[os.path.basename (output)] = h
+
+	if new == old:
+		return
+
+	tmp = path (book) + '.tmp'
+
+	with open (tmp, 'w') as f:
+		json.dump (new, f, indent = '\t', sort_keys = True)
+		f.write ('\n')
+
+	os.replace (tmp, path (book))
+
+def stale (book, hashes, force = False):
+	old = load (book)
+
+	return [output for output, h in hashes.items ()
+		if force or old.get (os.path.basename (output)) != h or
+		   not os.path.exists (output)]
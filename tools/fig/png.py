@@ -0,0 +1,134 @@
+#
+# Compact PNG Encoder for line art figures
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Figures are black line art on white, thus their pixels are opaque shades
+# of gray, and a few of them only. Such an image is written as 1-bit gray,
+# 2 or 4-bit palette or 8-bit gray PNG with exactly the same pixels as
+# cairo writes as 32-bit RGBA.
+#
+
+import struct, zlib
+
+filters = ['auto', 'none', 'sub', 'up', 'adaptive']
+
+def chunk (kind, data):
+	crc = zlib.crc32 (kind + data)
+
+	return struct.pack ('>I', len (data)) + kind + data + struct.pack ('>I', crc)
+
+#
+# Returns gray levels of ARGB32 surface or None if it is not opaque gray
+#
+def gray (surface):
+	surface.flush ()
+
+	w, h, stride = surface.get_width (), surface.get_height (), surface.get_stride ()
+	data = bytes (surface.get_data ())
+
+	if stride != w * 4:
+		data = b''.join (data[y * stride : y * stride + w * 4] for y in range (h))
+
+	b, g, r, a = data[0::4], data[1::4], data[2::4], data[3::4]
+
+	if b != g or g != r or a.count (255) != len (a):
+		return None
+
+	return g
+
+#
+# Packs indices of pixel levels into rows of depth-bit samples, returns
+# packed rows and row size in bytes
+#
+def pack (pixels, w, h, levels, depth):
+	digits = b'0123456789abcdef'[:len (levels)]
+	pixels = pixels.translate (bytes.maketrans (bytes (levels), digits))
+
+	per  = 8 // depth
+	size = (w + per - 1) // per
+	pad  = b'0' * (size * per - w)
+	base = 1 << depth
+	rows = []
+
+	for y in range (h):
+		row = pixels[y * w : (y + 1) * w] + pad
+		rows.append (int (row, base).to_bytes (size, 'big'))
+
+	return b''.join (rows), size
+
+def cost (row):
+	return sum (x if x < 128 else 256 - x for x in row)
+
+def filtered (row, prev, kind):
+	if kind == 'sub':
+		return b'\1' + bytes ((x - a) & 255 for x, a in zip (row, b'\0' + row[:-1]))
+
+	if kind == 'up':
+		return b'\2' + bytes ((x - b) & 255 for x, b in zip (row, prev))
+
+	return b'\0' + row
+
+def scan (pixels, w, h, kind):
+	prev = bytes (w)
+	rows = []
+
+	for y in range (h):
+		row = pixels[y * w : (y + 1) * w]
+
+		if kind == 'adaptive':
+			o = min ((filtered (row, prev, k) for k in ['none', 'sub', 'up']),
+				 key = lambda o: cost (o[1:]))
+		else:
+			o = filtered (row, prev, kind)
+
+		rows.append (o)
+		prev = row
+
+	return b''.join (rows)
+
+#
+# Filters do not pay off for packed pixels, thus the auto filter is none
+# for them and adaptive for 8-bit gray.
+#
+def encode (surface, level = 9, filter = 'auto'):
+	pixels = gray (surface)
+
+	if pixels is None:
+		return None
+
+	w, h   = surface.get_width (), surface.get_height ()
+	levels = sorted (set (pixels))
+	plte   = b''.join (bytes ([v, v, v]) for v in levels)
+
+	if levels == [0, 255] or levels in ([0], [255]):
+		depth, color, plte = 1, 0, None
+		levels = [0, 255]
+	elif len (levels) <= 16:
+		depth, color = (1 if len (levels) <= 2 else
+				2 if len (levels) <= 4 else 4), 3
+	else:
+		depth, color, plte = 8, 0, None
+
+	if depth < 8:
+		pixels, size = pack (pixels, w, h, levels, depth)
+	else:
+		size = w
+
+	if filter == 'auto':
+		filter = 'none' if depth < 8 else 'adaptive'
+
+	raw = scan (pixels, size, h, filter)
+
+	o = [b'\x89PNG\r\n\x1a\n',
+	     chunk (b'IHDR', struct.pack ('>IIBBBBB', w, h, depth, color, 0, 0, 0))]
+
+	if plte is not None:
+		o.append (chunk (b'PLTE', plte))
+
+	o.append (chunk (b'IDAT', zlib.compress (raw, level)))
+	o.append (chunk (b'IEND', b''))
+
+	return b''.join (o)
@@ -0,0 +1,84 @@
+#
+# Figure Profile: drawing call counters and per-figure timings
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+import csv, json
+
+from collections import Counter
+
+names = ['move_to', 'line_to', 'stroke', 'show_text', 'text_extents']
+calls = Counter ()
+
+#
+# Counting context stands for cairo context while profiling is on, any
+# call not counted goes to cairo context as is.
+#
+class Context:
+	def __init__ (self, c):
+		self.c = c
+
+	def __getattr__ (self, name):
+		return getattr (self.c, name)
+
+	def move_to (self, x, y):
+		calls['move_to'] += 1
+		self.c.move_to (x, y)
+
+	def line_to (self, x, y):
+		calls['line_to'] += 1
+		self.c.line_to (x, y)
+
+	def stroke (self):
+		calls['stroke'] += 1
+		self.c.stroke ()
+
+	def show_text (self, label):
+		calls['show_text'] += 1
+		self.c.show_text (label)
+
+	def text_extents (self, label):
+		calls['text_extents'] += 1
+		return self.c.text_extents (label)
+
+def counts (before):
+	return {name: calls[name] - before[name] for name in names}
+
+#
+# Record of a figure: figure and its drawing function, layout (create and
+# draw) and encoding time in seconds, bytes written and call counts.
+#
+fields = ['figure', 'draw', 'layout', 'encode', 'bytes'] + names
+
+def dump (records, path):
+	records = sorted (records, key = lambda o: o['figure'])
+
+	with open (path, 'w', newline = '') as f:
+		if path.endswith ('.csv'):
+			w = csv.DictWriter (f, fields)
+			w.writeheader ()
+			w.writerows (records)
+		else:
+			json.dump (records, f, indent = '\t')
+			f.write ('\n')
+
+def report (records):
+	draws = {}
+
+	for o in records:
+		t = draws.setdefault (o['draw'], Counter ())
+		t.update ({k: o[k] for k in ['layout', 'encode', 'bytes'] + names})
+		t['figures'] += 1
+
+	lines = []
+
+	for name, t in sorted (draws.items (), key = lambda o: -o[1]['layout'] - o[1]['encode']):
+		lines.append (f'{name}: {t["figures"]} figures, '
+			      f'layout {t["layout"] * 1e3:.1f} ms, '
+			      f'encode {t["encode"] * 1e3:.1f} ms, {t["bytes"]} bytes, ' +
+			      ', '.join (f'{t[k]} {k}' for k in names))
+
+	return lines
@@ -0,0 +1,191 @@
+#
+# Rectilinear Raster: axis-aligned strokes filled directly with NumPy
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Word format diagrams are made of horizontal and vertical lines almost
+# entirely. Raster context stands for cairo context of an image surface:
+# it keeps the path in device space, and a stroke of a path made of axis
+# aligned segments only with solid source and without dashes is filled
+# into surface pixels with NumPy slices. Anything else, text included, is
+# passed to cairo with the path as is.
+#
+# Coverage of a segment is a box of line width with its ends extended by
+# half of width for square caps or by area of round cap (pi/4 of half of
+# width), pixel coverage of a box is a product of coverages of its spans
+# by the pixel. Boxes of one stroke are joined with maximum of coverage.
+# Thus pixels of round caps and antialiased edges may differ from cairo
+# slightly: verify mode tells how much.
+#
+
+import importlib.util, math
+
+from . import lazy
+
+cairo = lazy.module ('cairo', globals ())
+numpy = lazy.module ('numpy', globals ()) if importlib.util.find_spec ('numpy') \
+	else None
+
+def available ():
+	return numpy is not None
+
+#
+# Pixels [i, j) of [lo, hi) a span [a, b) touches and their coverage by it
+#
+def span (a, b, lo, hi):
+	i, j = max (lo, math.floor (a)), min (hi, math.ceil (b))
+	x = numpy.arange (i, max (i, j), dtype = numpy.float32)
+
+	return i, j, numpy.clip (numpy.minimum (x + 1, b) - numpy.maximum (x, a), 0, 1)
+
+class Context:
+	def __init__ (self, c):
+		self.c     = c
+		self.path  = []		# subpaths of points in device space
+		self.point = None
+
+	def spill (self):
+		if not self.path:
+			return
+
+		c = self.c
+		m = c.get_matrix ()
+		c.identity_matrix ()
+
+		for points in self.path:
+			c.move_to (*points[0])
+
+			for p in points[1:]:
+				c.line_to (*p)
+
+		c.set_matrix (m)
+		self.path, self.point = [], None
+
+	# any call not handled here takes the path in cairo first
+	def __getattr__ (self, name):
+		self.spill ()
+		return getattr (self.c, name)
+
+	def move_to (self, x, y):
+		self.point = self.c.user_to_device (x, y)
+		self.path.append ([self.point])
+
+	def line_to (self, x, y):
+		if self.point is None:
+			self.move_to (x, y)
+			return
+
+		self.point = self.c.user_to_device (x, y)
+		self.path[-1].append (self.point)
+
+	def has_current_point (self):
+		return self.point is not None or self.c.has_current_point ()
+
+	def new_path (self):
+		self.path, self.point = [], None
+		self.c.new_path ()
+
+	# text leaves current point behind, it is not a path to stroke
+	def drawn (self):
+		return any (kind != cairo.PATH_MOVE_TO for kind, points in self.c.copy_path ())
+
+	def stroke (self):
+		if self.path and not self.drawn () and self.fill_strokes ():
+			self.path, self.point = [], None
+			self.c.new_path ()
+			return
+
+		self.spill ()
+		self.c.stroke ()
+
+	def boxes (self):
+		c = self.c
+		m = c.get_matrix ()
+
+		if m.xy != 0 or m.yx != 0 or abs (m.xx) != abs (m.yy):
+			return None
+
+		hw  = c.get_line_width () * abs (m.xx) / 2
+		cap = c.get_line_cap ()
+		ext = 0 if cap == cairo.LINE_CAP_BUTT else \
+		      hw if cap == cairo.LINE_CAP_SQUARE else hw * math.pi / 4
+		o   = []
+
+		for points in self.path:
+			for (x0, y0), (x1, y1) in zip (points, points[1:]):
+				if x0 != x1 and y0 != y1:
+					return None
+
+				x0, x1 = min (x0, x1), max (x0, x1)
+				y0, y1 = min (y0, y1), max (y0, y1)
+
+				if x0 == x1 and y0 == y1:
+					continue
+
+				if y0 == y1:
+					o.append ((x0 - ext, y0 - hw, x1 + ext, y1 + hw))
+				else:
+					o.append ((x0 - hw, y0 - ext, x1 + hw, y1 + ext))
+
+		return o
+
+	#
+	# Returns False if the path cannot be filled here
+	#
+	def fill_strokes (self):
+		c, s = self.c, self.c.get_target ()
+		r = c.get_source ()
+
+		if not isinstance (r, cairo.SolidPattern) or c.get_dash_count () > 0 or \
+		   c.get_operator () != cairo.OPERATOR_OVER or \
+		   s.get_format () != cairo.FORMAT_ARGB32:
+			return False
+
+		try:
+			clip = c.copy_clip_rectangle_list ()
+		except cairo.Error:
+			return False
+
+		boxes = self.boxes ()
+
+		if boxes is None or len (clip) != 1:
+			return False
+
+		# clip rectangles are in user space
+		cx, cy, cw, ch = clip[0]
+		ax, ay = c.user_to_device (cx, cy)
+		bx, by = c.user_to_device (cx + cw, cy + ch)
+
+		w, h = s.get_width (), s.get_height ()
+		x0, y0 = max (0, round (min (ax, bx))), max (0, round (min (ay, by)))
+		x1, y1 = min (w, round (max (ax, bx))), min (h, round (max (ay, by)))
+
+		if x0 >= x1 or y0 >= y1:
+			return True
+
+		cov = numpy.zeros ((y1 - y0, x1 - x0), numpy.float32)
+
+		# every box is joined into its own slice of coverage only
+		for bx0, by0, bx1, by1 in boxes:
+			i0, i1, sx = span (bx0, bx1, x0, x1)
+			j0, j1, sy = span (by0, by1, y0, y1)
+
+			if i0 < i1 and j0 < j1:
+				box = cov[j0 - y0 : j1 - y0, i0 - x0 : i1 - x0]
+				numpy.maximum (box, numpy.outer (sy, sx), out = box)
+
+		red, green, blue, alpha = r.get_rgba ()
+		src = numpy.array ([blue, green, red, 1.0], numpy.float32) * alpha * 255
+
+		s.flush ()
+
+		data = numpy.ndarray ((h, s.get_stride ()), numpy.uint8, s.get_data ())
+		dst  = data[y0:y1, x0 * 4 : x1 * 4].reshape (y1 - y0, x1 - x0, 4)
+		m    = numpy.round (cov * 255)[..., None] / 255
+
+		dst[...] = numpy.round (src * m + dst * (1 - alpha * m)).astype (numpy.uint8)
+
+		s.mark_dirty ()
+		return True
@@ -0,0 +1,80 @@
+#
+# Figure Registry: books and their figures
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+import os
+
+books = []
+
+class Figure:
+	def __init__ (self, book, name, canvas, draw, args):
+		self.book   = book
+		self.name   = name
+		self.canvas = canvas		# create () arguments
+		self.draw   = draw
+		self.args   = args
+
+		self.path = self.output ('png')
+
+	def output (self, fmt, scale = 1):
+		return self.book.output (self.name, fmt, scale)
+
+	def __repr__ (self):
+		return self.book.name + '/' + self.name
+
+class Book:
+	def __init__ (self, name, path, font = 'Latin Modern Sans'):
+		self.name = name
+		self.root = os.path.dirname (os.path.realpath (path))
+		self.font = font
+
+		self.figures = {}
+		self.aliases = {}		# name -> name of the same figure
+
+		books.append (self)
+
+	def output (self, name, fmt, scale = 1):
+		suffix = '' if scale == 1 else f'@{scale}x'
+
+		return os.path.join (self.root, f'fig-{name}{suffix}.{fmt}')
+
+	def add (self, name, canvas, draw, *args):
+		if name in self.figures or name in self.aliases:
+			raise ValueError (f'{self.name}: duplicate figure {name}')
+
+		self.figures[name] = Figure (self, name, canvas, draw, args)
+
+	def alias (self, name, target):
+		if name in self.figures or name in self.aliases:
+			raise ValueError (f'{self.name}: duplicate figure {name}')
+
+		self.aliases[name] = target
+
+	def figure (self, name, *canvas):
+		def register (draw):
+			self.add (name, canvas, draw)
+			return draw
+
+		return register
+
+	def family (self, *canvas):
+		def register (draw):
+			def add (name, *args):
+				self.add (name, canvas, draw, *args)
+
+			return add
+
+		return register
+
+def lookup (key):
+	book, name = key
+
+	for o in books:
+		if o.name == book:
+			return o.figures[name]
+
+	raise KeyError (book)
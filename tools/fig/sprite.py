@@ -0,0 +1,180 @@
+#
+# Figure Sprites: figures of a book packed into a few atlas images
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Figures are packed with skyline bottom-left algorithm: skyline is a list
+# of segments (x, y, width) over the whole width of sheet, every rectangle
+# (the tallest first) is put where its bottom is the lowest, leftmost of
+# such places. Rectangles that do not fit into the height of a sheet go to
+# the next sheet. Index of sprites is written as JSON and as CSS classes
+# named after figure files.
+#
+
+import json, os
+
+from glob import glob
+
+from . import lazy
+from .engine import create, encode, store
+
+cairo = lazy.module ('cairo', globals ())
+
+def fit (sky, i, w):
+	y, left = 0, w
+
+	for sx, sy, sw in sky[i:]:
+		y = max (y, sy)
+		left -= sw
+
+		if left <= 0:
+			return y
+
+	return None
+
+def place (sky, x, y, w, h):
+	o = []
+
+	for sx, sy, sw in sky:
+		if sx + sw <= x or sx >= x + w:
+			o.append ((sx, sy, sw))
+			continue
+
+		if sx < x:
+			o.append ((sx, sy, x - sx))
+
+		if sx + sw > x + w:
+			o.append ((x + w, sy, sx + sw - x - w))
+
+	o.append ((x, y + h, w))
+	o.sort ()
+
+	merged = [o[0]]
+
+	for sx, sy, sw in o[1:]:
+		px, py, pw = merged[-1]
+
+		if py == sy:
+			merged[-1] = (px, py, pw + sw)
+		else:
+			merged.append ((sx, sy, sw))
+
+	return merged
+
+#
+# Packs rectangles (key, w, h) into sheets of given width and height limit,
+# returns list of sheets, sheet is a list of (key, x, y, w, h).
+#
+def pack (rects, width, height):
+	todo   = sorted (rects, key = lambda o: (-o[2], -o[1]))
+	sheets = []
+
+	while todo:
+		sky, sheet, rest = [(0, 0, width)], [], []
+
+		for key, w, h in todo:
+			best = None
+
+			for i, (x, sy, sw) in enumerate (sky):
+				if x + w > width:
+					break
+
+				y = fit (sky, i, w)
+
+				if y + h <= height and (best is None or y < best[1]):
+					best = x, y
+
+			if best is None:
+				rest.append ((key, w, h))
+				continue
+
+			sheet.append ((key, *best, w, h))
+			sky = place (sky, *best, w, h)
+
+		if not sheet:		# taller than a sheet: gets one of its own
+			key, w, h = rest.pop (0)
+			sheet.append ((key, 0, 0, w, h))
+
+		sheets.append (sheet)
+		todo = rest
+
+	return sheets
+
+def sheet_name (i):
+	return f'fig-sprites-{i}.png'
+
+def index (sheets, pad):
+	o = {}
+
+	for i, sheet in enumerate (sheets):
+		for fig, x, y, w, h in sheet:
+			o[fig.name] = {'sheet': sheet_name (i), 'x': x, 'y': y,
+				       'w': w - pad, 'h': h - pad}
+
+	return o
+
+def css (entries):
+	lines = []
+
+	for name, o in entries.items ():
+		lines.append (f'.fig-{name} {{ background: url({o["sheet"]}) '
+			      f'{-o["x"]}px {-o["y"]}px; width: {o["w"]}px; '
+			      f'height: {o["h"]}px; }}\n')
+
+	return ''.join (lines)
+
+def draw (sheet, images):
+	w = max (x + iw for fig, x, y, iw, ih in sheet)
+	h = max (y + ih for fig, x, y, iw, ih in sheet)
+
+	surface = cairo.ImageSurface (cairo.FORMAT_ARGB32, w, h)
+	c = cairo.Context (surface)
+
+	c.set_source_rgb (1.0, 1.0, 1.0)
+	c.paint ()
+
+	for fig, x, y, iw, ih in sheet:
+		c.set_source_surface (images[fig], x, y)
+		c.paint ()
+
+	return surface
+
+#
+# Figure images are not returned to the surface pool: all of them are kept
+# until sheets are drawn. Pad is a gap between sprites in pixels. Returns
+# paths written.
+#
+def sprites (book, opts, width = 1024, height = 4096, pad = 1):
+	images, rects = {}, []
+
+	for fig in book.figures.values ():
+		surface, c = create (*fig.canvas, font = book.font)
+		fig.draw (c, *fig.args)
+		surface.flush ()
+
+		images[fig] = surface
+		rects.append ((fig, surface.get_width () + pad, surface.get_height () + pad))
+
+	width  = max ([width] + [w for fig, w, h in rects])
+	sheets = pack (rects, width, height)
+	paths  = []
+
+	for i, sheet in enumerate (sheets):
+		path = os.path.join (book.root, sheet_name (i))
+		store (path, encode (draw (sheet, images), opts.png, opts.png_level,
+				     opts.png_filter))
+		paths.append (path)
+
+	for path in glob (os.path.join (book.root, sheet_name ('*'))):
+		if not path in paths:
+			os.remove (path)
+
+	entries = index (sheets, pad)
+	base    = os.path.join (book.root, 'fig-sprites')
+
+	store (base + '.css', css (entries).encode ())
+	store (base + '.json', (json.dumps (entries, indent = '\t') + '\n').encode ())
+
+	return paths + [base + '.css', base + '.json']
@@ -0,0 +1,176 @@
+#
+# Figure Tables: declarative instruction encoding figures
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Table is a text file with tab-separated columns, any run of tabs is one
+# separator, lines starting with '#' are comments:
+#
+#	book	<name>				book name (table without fig-gen.py)
+#	font	<face>				font face
+#	canvas	<M> <W> <H> <S>			create () arguments for next rows
+#	format	<name> <ticks> <nums> <fields>	word format
+#	<figure> <format> <values> <name> <syntax> <time>
+#
+# Fields are separated by '|', each one is a size in bits and a label, label
+# '$n' refers to n-th row value, '-' stands for no label. Values of a row are
+# separated by spaces, '-' in a value or text column stands for nothing.
+#
+
+import os, re
+
+from collections import namedtuple
+
+from .engine import ticks, bfls, desc
+from .registry import Book
+
+Format = namedtuple ('Format', 'prog nums fields values')
+
+def word (c, prog, nums, fields, name, syntax, time):
+	ticks (c, 0, 1, prog, nums)
+	bfls  (c, 0, 1, fields)
+	desc  (c, 0, 1, name, syntax, time)
+
+def none (o):
+	return None if o == '-' else o
+
+def number (o):
+	return float (o) if '.' in o else int (o)
+
+class Table:
+	def __init__ (self, path):
+		self.path    = path
+		self.book    = None
+		self.font    = None
+		self.canvas  = (8, 32, 4.3, 11)
+		self.formats = {}
+		self.figures = set ()
+		self.rows    = []		# (figure, canvas, record)
+
+		with open (path, encoding = 'utf-8') as f:
+			for self.line, s in enumerate (f, 1):
+				s = s.rstrip ('\n')
+
+				if s.strip () and not s.startswith ('#'):
+					self.parse (re.split (r'\t+', s.strip ()))
+
+	def error (self, message):
+		raise ValueError (f'{self.path}:{self.line}: {message}')
+
+	def parse (self, cols):
+		head, args = cols[0], cols[1:]
+
+		if   head == 'book':	self.book = self.single (args)
+		elif head == 'font':	self.font = self.single (args)
+		elif head == 'canvas':	self.canvas = self.parse_canvas (args)
+		elif head == 'format':	self.parse_format (args)
+		else:			self.parse_row (head, args)
+
+	def single (self, args):
+		if len (args) != 1:
+			self.error ('single argument expected')
+
+		return args[0]
+
+	def parse_canvas (self, args):
+		try:
+			o = tuple (number (o) for o in self.single (args).split ())
+		except ValueError:
+			self.error ('invalid canvas geometry')
+
+		if not 4 <= len (o) <= 7:
+			self.error ('canvas: 4 to 7 numbers expected')
+
+		return o
+
+	def parse_format (self, args):
+		if len (args) != 4:
+			self.error ('format: name, ticks, nums and fields expected')
+
+		name, prog, nums, spec = args
+
+		if name in self.formats:
+			self.error (f'duplicate format {name}')
+
+		if prog.strip ('lo. '):
+			self.error (f'format {name}: ticks are l, o, . or space')
+
+		if nums.strip ('x.'):
+			self.error (f'format {name}: bit numbers are x or .')
+
+		if len (nums) != len (prog) - 1:
+			self.error (f'format {name}: {len (prog) - 1} bit numbers expected')
+
+		fields, values = [], 0
+
+		for o in spec.split ('|'):
+			size, _, label = o.strip ().partition (' ')
+			label = label.strip ()
+
+			if not size.isdigit () or not label:
+				self.error (f'format {name}: invalid field {o.strip ()!r}')
+
+			if label.startswith ('$'):
+				if not label[1:].isdigit () or int (label[1:]) < 1:
+					self.error (f'format {name}: invalid value reference {label}')
+
+				values = max (values, int (label[1:]))
+
+			fields.append ((int (size), label))
+
+		if sum (size for size, label in fields) != len (prog) - 1:
+			self.error (f'format {name}: fields do not cover {len (prog) - 1} bits')
+
+		self.formats[name] = Format (prog, nums, tuple (fields), values)
+
+	def parse_row (self, figure, args):
+		if len (args) != 5:
+			self.error (f'{figure}: format, values, name, syntax and time expected')
+
+		name, values, title, syntax, time = args
+
+		if figure in self.figures:
+			self.error (f'duplicate figure {figure}')
+
+		if not name in self.formats:
+			self.error (f'{figure}: unknown format {name}')
+
+		f = self.formats[name]
+		values = [] if values == '-' else values.split ()
+		fields = []
+
+		if len (values) != f.values:
+			self.error (f'{figure}: {f.values} values expected for format {name}')
+
+		for size, label in f.fields:
+			if label.startswith ('$'):
+				label = values[int (label[1:]) - 1]
+
+			fields += [size, none (label)]
+
+		record = (f.prog, f.nums, tuple (fields),
+			  none (title), none (syntax), none (time))
+
+		self.figures.add (figure)
+		self.rows.append ((figure, self.canvas, record))
+
+	def register (self, book):
+		for figure, canvas, record in self.rows:
+			book.add (figure, canvas, word, *record)
+
+def load (book, path):
+	table = Table (os.path.join (book.root, path))
+	table.register (book)
+
+def book (path):
+	table = Table (path)
+	name  = table.book or os.path.basename (os.path.dirname (os.path.realpath (path)))
+	o     = Book (name, path)
+
+	if table.font is not None:
+		o.font = table.font
+
+	table.register (o)
+	return o
@@ -0,0 +1,123 @@
+#
+# Figure Verifier: compares rendered figures with committed images
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Figure is rendered and encoded in memory, equal bytes of encoded figure
+# and committed image settle the matter at once. Otherwise both images are
+# compared pixel by pixel, with NumPy if it is installed, and image of
+# differences is written for a mismatch: pixels that differ are red on
+# light gray image expected.
+#
+
+import array, importlib.util, os
+
+from . import lazy
+from .engine import create, encode, ink, release, replay
+
+cairo = lazy.module ('cairo', globals ())
+numpy = lazy.module ('numpy', globals ()) if importlib.util.find_spec ('numpy') \
+	else None
+
+class Mismatch (Exception):
+	pass
+
+def load (path):
+	src = cairo.ImageSurface.create_from_png (path)
+	w, h = src.get_width (), src.get_height ()
+
+	surface = cairo.ImageSurface (cairo.FORMAT_ARGB32, w, h)
+	c = cairo.Context (surface)
+	c.set_operator (cairo.OPERATOR_SOURCE)
+	c.set_source_surface (src)
+	c.paint ()
+	surface.flush ()
+
+	return surface
+
+def pixels (surface):
+	w, h, stride = surface.get_width (), surface.get_height (), surface.get_stride ()
+	data = bytes (surface.get_data ())
+
+	if stride != w * 4:
+		data = b''.join (data[y * stride : y * stride + w * 4] for y in range (h))
+
+	return data
+
+def light (v):
+	g = 192 + ((v >> 8) & 255) // 4
+
+	return 0xff000000 | g << 16 | g << 8 | g
+
+#
+# Returns number of pixels that differ and ARGB32 pixels of differences
+#
+def compare (a, b):
+	if numpy is not None:
+		x = numpy.frombuffer (a, numpy.uint32)
+		y = numpy.frombuffer (b, numpy.uint32)
+		d = x != y
+		n = int (numpy.count_nonzero (d))
+
+		if n == 0:
+			return 0, None
+
+		g = 192 + ((y >> 8) & 255) // 4
+		o = numpy.where (d, numpy.uint32 (0xffff0000),
+				 0xff000000 | g << 16 | g << 8 | g).astype (numpy.uint32)
+		return n, o.tobytes ()
+
+	x = memoryview (a).cast ('I')
+	y = memoryview (b).cast ('I')
+	n = sum (1 for p, q in zip (x, y) if p != q)
+
+	if n == 0:
+		return 0, None
+
+	o = array.array ('I', [0xffff0000 if p != q else light (q) for p, q in zip (x, y)])
+	return n, o.tobytes ()
+
+def save (data, w, h, path):
+	os.makedirs (os.path.dirname (path) or '.', exist_ok = True)
+
+	surface = cairo.ImageSurface.create_for_data (bytearray (data),
+						      cairo.FORMAT_ARGB32, w, h, w * 4)
+	surface.write_to_png (path)
+
+def diff_path (fig, opts):
+	return os.path.join (opts.diff, fig.book.name, 'fig-' + fig.name + '.png')
+
+def check (fig, opts):
+	path = fig.output ('png')
+
+	surface, c = create (*fig.canvas, font = fig.book.font,
+			     target = 'png' if opts.crop is None else 'record',
+			     background = opts.crop is None)
+	fig.draw (c, *fig.args)
+
+	image = surface if opts.crop is None else \
+		replay (surface, 'png', 1, ink (surface, opts.crop))
+
+	try:
+		data = encode (image, opts.png, opts.png_level, opts.png_filter)
+
+		with open (path, 'rb') as f:
+			if f.read () == data:
+				return
+
+		expected = load (path)
+		w, h = image.get_width (), image.get_height ()
+
+		if (expected.get_width (), expected.get_height ()) != (w, h):
+			raise Mismatch (f'size {w}x{h}, expected {expected.get_width ()}x'
+					f'{expected.get_height ()}')
+
+		n, d = compare (pixels (image), pixels (expected))
+	finally:
+		release (surface, c)
+
+	if n > 0:
+		save (d, w, h, diff_path (fig, opts))
+		raise Mismatch (f'{n} pixels differ, see {diff_path (fig, opts)}')
@@ -0,0 +1,170 @@
+#
+# Figure Watcher: renders figures again as their sources change
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Directories of figure sources and of the engine are watched with inotify
+# (or polled where there is no inotify). A changed generator or table is
+# loaded again, then figures are built as usual: manifest tells the figures
+# whose inputs changed, and only these are rendered. Rebuilds run in this
+# process, so engine caches stay warm. A change of the engine itself
+# restarts the watcher.
+#
+
+import ctypes, ctypes.util, os, select, struct, sys, time
+
+from glob import glob
+
+from . import build, loader, registry
+
+engine = os.path.dirname (os.path.realpath (__file__))
+
+IN_CLOSE_WRITE	= 0x008
+IN_MOVED_TO	= 0x080
+IN_CREATE	= 0x100
+IN_DELETE	= 0x200
+
+class Inotify:
+	mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+	def __init__ (self):
+		self.libc = ctypes.CDLL (ctypes.util.find_library ('c'), use_errno = True)
+		self.fd   = self.libc.inotify_init1 (os.O_CLOEXEC)
+		self.dirs = {}
+
+		if self.fd < 0:
+			raise OSError (ctypes.get_errno (), 'inotify_init1 failed')
+
+	def add (self, path):
+		wd = self.libc.inotify_add_watch (self.fd, os.fsencode (path), self.mask)
+
+		if wd < 0:
+			raise OSError (ctypes.get_errno (), f'cannot watch {path}')
+
+		self.dirs[wd] = path
+
+	def read (self):
+		data, o, i = os.read (self.fd, 65536), set (), 0
+
+		while i < len (data):
+			wd, mask, cookie, size = struct.unpack_from ('iIII', data, i)
+			name = data[i + 16 : i + 16 + size].rstrip (b'\0')
+			i += 16 + size
+
+			if wd in self.dirs:
+				o.add (os.path.join (self.dirs[wd], os.fsdecode (name)))
+
+		return o
+
+	# editors write a file in several steps, wait for the burst to settle
+	def wait (self):
+		o = self.read ()
+
+		while select.select ([self.fd], [], [], 0.015)[0]:
+			o |= self.read ()
+
+		return o
+
+class Poll:
+	def __init__ (self, period = 1.0):
+		self.period = period
+		self.dirs   = []
+		self.seen   = {}
+
+	def scan (self):
+		o = {}
+
+		for d in self.dirs:
+			for path in glob (os.path.join (d, '*')):
+				try:
+					o[path] = os.stat (path).st_mtime_ns
+				except FileNotFoundError:
+					pass
+
+		return o
+
+	def add (self, path):
+		self.dirs.append (path)
+		self.seen = self.scan ()
+
+	def wait (self):
+		while True:
+			time.sleep (self.period)
+
+			now = self.scan ()
+			o   = {p for p in now.keys () | self.seen.keys ()
+			       if now.get (p) != self.seen.get (p)}
+			self.seen = now
+
+			if o:
+				return o
+
+def watcher ():
+	try:
+		return Inotify ()
+	except (AttributeError, OSError, TypeError):
+		return Poll ()
+
+# outputs and manifest written by the builder are not sources
+def source (path):
+	return path.endswith (('.py', '.txt')) and not '__pycache__' in path
+
+#
+# Books of a source that fails to load stay as they were, so a typo in a
+# generator does not drop its figures out of the build.
+#
+def reload (loaded, path):
+	old = loaded.get (path, [])
+
+	for book in old:
+		registry.books.remove (book)
+
+	n = len (registry.books)
+
+	try:
+		loader.load (path)
+	except Exception as e:
+		del registry.books[n:]
+		registry.books += old
+		print (f'error: {path}: {type (e).__name__}: {e}', file = sys.stderr)
+		return
+
+	loaded[path] = registry.books[n:]
+
+def run (paths, args):
+	paths  = [os.path.realpath (o) for o in paths]
+	loaded = {}
+	w      = watcher ()
+
+	for d in sorted ({os.path.dirname (o) for o in paths} | {engine}):
+		w.add (d)
+
+	for path in paths:
+		reload (loaded, path)
+
+	# render in this process from the first build on to warm its caches
+	args.jobs = 1
+	build.run (registry.books, args)
+
+	print ('watching for changes, press Ctrl-C to stop', file = sys.stderr)
+
+	try:
+		while True:
+			changed = {o for o in w.wait () if source (o)}
+			dirs    = {os.path.dirname (o) for o in changed}
+
+			if engine in dirs:
+				print ('engine changed, restarting', file = sys.stderr)
+				os.execv (sys.executable, [sys.executable] + sys.argv)
+
+			todo = [o for o in paths if os.path.dirname (o) in dirs]
+
+			for path in todo:
+				reload (loaded, path)
+
+			if todo:
+				build.run (registry.books, args)
+	except KeyboardInterrupt:
+		return 0
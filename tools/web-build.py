@@ -0,0 +1,15 @@
+#!/usr/bin/python3
+#
+# Site Builder: renders Markdown books into static HTML pages
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+import sys
+
+from web import build
+
+if __name__ == '__main__':
+	sys.exit (build.run (build.parser ().parse_args ()))
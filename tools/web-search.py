@@ -0,0 +1,15 @@
+#!/usr/bin/python3
+#
+# Full-Text Search: finds sections of all books by words and phrases
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+import sys
+
+from web import search
+
+if __name__ == '__main__':
+	sys.exit (search.run (search.parser ().parse_args ()))
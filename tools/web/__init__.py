@@ -0,0 +1,7 @@
+#
+# Static Site Generation Library
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
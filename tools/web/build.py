@@ -0,0 +1,326 @@
+#
+# Site Builder: renders Markdown books into static HTML pages
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Markdown files of a directory make a book, a file right in doc or ic is a
+# book of its own. Every page is written next to its place in the tree of
+# output directory, figures and images it uses are copied next to it. Only
+# pages whose source, neighbours or used files changed are rendered again
+# (see graph.py), in a process pool. Bump version on any change of the
+# renderer or the template that affects pages.
+#
+
+import argparse, hashlib, multiprocessing, os, re, shutil, sys
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from glob import glob
+
+from . import graph, markdown
+
+version = 1
+
+root = os.path.dirname (os.path.dirname (os.path.dirname (os.path.realpath (__file__))))
+
+def sources ():
+	found = []
+
+	for top in ['doc', 'ic']:
+		found += glob (os.path.join (root, top, '**', '*.md'), recursive = True)
+
+	return sorted (os.path.relpath (o, root).replace (os.sep, '/') for o in found)
+
+def books (pages):
+	o = {}
+
+	for page in pages:
+		d = os.path.dirname (page)
+		o.setdefault (page[:-3] if d in ('doc', 'ic') else d, []).append (page)
+
+	return o
+
+def language (text):
+	cyrillic = len (re.findall (r'[а-яёА-ЯЁ]', text))
+	latin    = len (re.findall (r'[a-zA-Z]', text))
+
+	return 'ru' if cyrillic > latin else 'en'
+
+def html_name (page):
+	return page[:-3] + '.html'
+
+def href (page, target):
+	return os.path.relpath (target, os.path.dirname (page) or '.')
+
+def store (path, data):
+	try:
+		with open (path, 'rb') as f:
+			if f.read () == data:
+				return False
+	except FileNotFoundError:
+		pass
+
+	os.makedirs (os.path.dirname (path), exist_ok = True)
+
+	with open (path, 'wb') as f:
+		f.write (data)
+
+	return True
+
+#
+# Files are copied with their times, thus a file of the same size and time
+# is taken as copied already.
+#
+def copy (src, dst):
+	s = os.stat (src)
+
+	try:
+		d = os.stat (dst)
+
+		if (s.st_size, s.st_mtime_ns) == (d.st_size, d.st_mtime_ns):
+			return False
+	except FileNotFoundError:
+		os.makedirs (os.path.dirname (dst), exist_ok = True)
+
+	shutil.copy2 (src, dst)
+	return True
+
+style = '''body { max-width: 50em; margin: 0 auto; padding: 0 1em;
+       font-family: serif; line-height: 1.4; }
+nav { font-family: sans-serif; padding: 0.5em 0; }
+nav a { margin-right: 1em; }
+img { max-width: 100%; }
+table { border-collapse: collapse; margin: 1em 0; }
+th, td { border: 1px solid #999; padding: 0.2em 0.5em; vertical-align: top; }
+pre { background: #f4f4f4; padding: 0.5em; overflow-x: auto; }
+.caption { font-style: italic; }
+.footnotes { font-size: smaller; border-top: 1px solid #999; }
+'''
+
+#
+# Navigation of a page: links to previous page, contents and next page of
+# its book, or None where there is no such page
+#
+def navs (books):
+	o = {}
+
+	for name, pages in books.items ():
+		up = 'index.html' if len (pages) == 1 else name + '/index.html'
+
+		for i, page in enumerate (pages):
+			prev = pages[i - 1] if i > 0 else None
+			next = pages[i + 1] if i + 1 < len (pages) else None
+			o[page] = (prev and html_name (prev), up, next and html_name (next))
+
+	return o
+
+def nav (page, links):
+	prev, up, next = links
+	o = []
+
+	if prev is not None:  o.append (f'<a href="{href (page, prev)}">Previous</a>')
+	if up   is not None:  o.append (f'<a href="{href (page, up)}">Contents</a>')
+	if next is not None:  o.append (f'<a href="{href (page, next)}">Next</a>')
+
+	return '<nav>' + ' '.join (o) + '</nav>'
+
+def template (page, title, body, lang, links = None):
+	bar = '' if links is None else nav (page, links) + '\n'
+
+	return f'''<!DOCTYPE html>
+<html lang="{lang}">
+<head>
+<meta charset="utf-8">
+<title>{markdown.escape (title)}</title>
+<link rel="stylesheet" href="{href (page, 'style.css')}">
+</head>
+<body>
+{bar}<main>
+{body}</main>
+{bar}</body>
+</html>
+'''
+
+def digest (text, links):
+	h = hashlib.sha256 ()
+
+	for o in [version, text, links]:
+		h.update (repr (o).encode ())
+		h.update (b'\0')
+
+	return h.hexdigest ()
+
+#
+# Files used by a page are taken relative to the root, links to other pages
+# are not uses: a page does not change as a page it links to changes.
+#
+def uses (page, refs):
+	o = []
+
+	for ref in refs:
+		rel = os.path.normpath (os.path.join (os.path.dirname (page), ref))
+
+		if not ref.endswith ('.md') and not rel.startswith ('..'):
+			o.append (rel.replace (os.sep, '/'))
+
+	return o
+
+def read (page):
+	with open (os.path.join (root, page), encoding = 'utf-8') as f:
+		return f.read ()
+
+#
+# Job returns an error message (or None), page title and files used
+#
+def job (page, links, out):
+	try:
+		text = read (page)
+		p    = markdown.render (text)
+		data = template (page, p.title or page, p.html, language (text), links)
+
+		store (os.path.join (out, html_name (page)), data.encode ())
+		return None, p.title, uses (page, p.refs)
+	except Exception as e:
+		return f'{type (e).__name__}: {e}', None, []
+
+def build (todo, opts):
+	results = {}
+
+	if opts.jobs == 1 or len (todo) < 2:
+		for page, links in todo:
+			results[page] = job (page, links, opts.output)
+
+		return results
+
+	ctx = multiprocessing.get_context ('fork')
+
+	with ProcessPoolExecutor (opts.jobs, mp_context = ctx) as pool:
+		jobs = {pool.submit (job, page, links, opts.output): page
+			for page, links in todo}
+
+		for f in as_completed (jobs):
+			try:
+				results[jobs[f]] = f.result ()
+			except Exception as o:
+				results[jobs[f]] = f'{type (o).__name__}: {o}', None, []
+
+	return results
+
+def contents (books, pages):
+	def title (page):
+		return pages.get (page, {}).get ('title') or os.path.basename (page)[:-3]
+
+	o = {}
+	top = []
+
+	for name, book in sorted (books.items ()):
+		if len (book) == 1:
+			top.append (f'<li><a href="{html_name (book[0])}">'
+				    f'{markdown.escape (title (book[0]))}</a></li>')
+			continue
+
+		top.append (f'<li><a href="{name}/index.html">{markdown.escape (name)}</a></li>')
+
+		index = name + '/index.html'
+		items = [f'<li><a href="{href (index, html_name (page))}">'
+			 f'{markdown.escape (title (page))}</a></li>' for page in book]
+		body  = f'<h1>{markdown.escape (name)}</h1>\n<ul>\n' + '\n'.join (items) + '\n</ul>\n'
+		o[index] = template (index, name, body, 'en', (None, 'index.html', None))
+
+	body = '<h1>Books</h1>\n<ul>\n' + '\n'.join (top) + '\n</ul>\n'
+	o['index.html'] = template ('index.html', 'Books', body, 'en')
+
+	return o
+
+def positive (s):
+	n = int (s)
+
+	if n < 1:
+		raise argparse.ArgumentTypeError (f'{n} is not a positive number')
+
+	return n
+
+def parser (description = 'Build static site of all books'):
+	p = argparse.ArgumentParser (description = description)
+
+	p.add_argument ('-j', '--jobs', type = positive, default = os.cpu_count (),
+			help = 'number of parallel jobs (default: number of CPUs)')
+	p.add_argument ('-f', '--force', action = 'store_true',
+			help = 'render all pages, changed or not')
+	p.add_argument ('-o', '--output', default = os.path.join (root, 'site'),
+			help = 'output directory (default: site)')
+	p.add_argument ('-n', '--dry-run', action = 'store_true',
+			help = 'list stale pages and why, render nothing')
+	p.add_argument ('-v', '--verbose', action = 'store_true',
+			help = 'list pages rendered')
+	return p
+
+def run (args):
+	pages = sources ()
+	shelf = books (pages)
+	links = navs (shelf)
+	old   = graph.load (args.output, version)
+	files = graph.Files (root)
+	new   = {}
+	todo  = []
+
+	for page in pages:
+		d   = digest (read (page), links[page])
+		why = 'forced' if args.force else graph.stale (old.get (page), d, files)
+
+		if why is None:
+			new[page] = old[page]
+		else:
+			todo.append ((page, links[page], d, why))
+
+	if args.dry_run:
+		for page, l, d, why in todo:
+			print (f'{page}: {why}')
+
+		return 0
+
+	results = build ([(page, l) for page, l, d, why in todo], args)
+	errors  = 0
+
+	for page, l, d, why in todo:
+		e, title, used = results[page]
+
+		if e is not None:
+			print (f'error: {page}: {e}', file = sys.stderr)
+			errors += 1
+			continue
+
+		new[page] = {'digest': d, 'title': title,
+			     'uses': {rel: files.digest (rel) for rel in used}}
+
+		for rel in used:
+			if files.digest (rel) is None:
+				print (f'warning: {page}: no file {rel}', file = sys.stderr)
+
+		if args.verbose:
+			print (f'{page}: {why}')
+
+	copied = 0
+
+	for page, entry in new.items ():
+		for rel in entry['uses']:
+			if entry['uses'][rel] is not None:
+				copied += copy (os.path.join (root, rel), os.path.join (args.output, rel))
+
+	for page in old.keys () - set (pages):
+		try:
+			os.remove (os.path.join (args.output, html_name (page)))
+		except FileNotFoundError:
+			pass
+
+	for name, data in contents (shelf, new).items ():
+		store (os.path.join (args.output, name), data.encode ())
+
+	store (os.path.join (args.output, 'style.css'), style.encode ())
+	graph.save (args.output, version, new)
+
+	print (f'{len (todo) - errors} pages rendered, {len (pages) - len (todo)} '
+	       f'up to date, {copied} files copied')
+
+	return 1 if errors else 0
@@ -0,0 +1,72 @@
+#
+# Site Dependency Graph: pages, the files they use and their hashes
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Graph is kept in the output directory and maps every page (Markdown file
+# relative to the root) to the digest of its inputs, the title and the files
+# it uses (figures and images) with their hashes as of the time it was
+# rendered. Page is stale if its inputs or any file it uses changed: the
+# source is not even parsed to tell that. Files are hashed once per build,
+# however many pages use them.
+#
+
+import hashlib, json, os
+
+name = 'site-graph.json'
+
+def path (out):
+	return os.path.join (out, name)
+
+def load (out, version):
+	try:
+		with open (path (out)) as f:
+			o = json.load (f)
+	except FileNotFoundError:
+		return {}
+
+	return o['pages'] if o.get ('version') == version else {}
+
+def save (out, version, pages):
+	tmp = path (out) + '.tmp'
+
+	with open (tmp, 'w') as f:
+		json.dump ({'version': version, 'pages': pages}, f, indent = '\t',
+			   sort_keys = True, ensure_ascii = False)
+		f.write ('\n')
+
+	os.replace (tmp, path (out))
+
+class Files:
+	def __init__ (self, root):
+		self.root   = root
+		self.hashes = {}
+
+	def digest (self, rel):
+		if not rel in self.hashes:
+			try:
+				with open (os.path.join (self.root, rel), 'rb') as f:
+					self.hashes[rel] = hashlib.sha256 (f.read ()).hexdigest ()
+			except OSError:
+				self.hashes[rel] = None
+
+		return self.hashes[rel]
+
+#
+# Returns why the page is stale: 'new', 'changed' or a file it uses that
+# changed, or None if the page is up to date.
+#
+def stale (entry, digest, files):
+	if entry is None:
+		return 'new'
+
+	if entry['digest'] != digest:
+		return 'changed'
+
+	for rel, h in sorted (entry['uses'].items ()):
+		if files.digest (rel) != h:
+			return rel
+
+	return None
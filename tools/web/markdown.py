@@ -0,0 +1,497 @@
+#
+# Markdown Renderer: the subset of Markdown the books are written in
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Blocks: ATX headings, paragraphs, captions (': text'), fenced and indented
+# code, pipe tables, bullet and ordered lists, block quotes, rules, raw HTML
+# blocks and footnotes. Inlines: backslash escapes, code spans, emphasis,
+# links, images, footnote references and raw HTML tags. Links to other
+# Markdown files are turned into links to their HTML pages.
+#
+
+import html, re
+
+from collections import namedtuple
+
+#
+# Page is rendered HTML, title (text of the first heading), headings as
+# (level, id, text, source line) and local files referenced by links and
+# images.
+#
+Page = namedtuple ('Page', 'html title headings refs')
+
+FENCE	= re.compile (r'^ {0,3}(```+|~~~+)\s*([\w+-]*)')
+HEADING	= re.compile (r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+RULE	= re.compile (r'^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+BULLET	= re.compile (r'^( *)([-*+])([ \t]+|$)')
+ORDERED	= re.compile (r'^( *)(\d{1,9})([.)])([ \t]+|$)')
+NOTE	= re.compile (r'^\[\^([^\]]+)\]:[ \t]*(.*)')
+HTML	= re.compile (r'^ {0,3}</?([a-zA-Z][a-zA-Z0-9]*)(?=[\s/>]|$)')
+DELIM	= re.compile (r'^ {0,3}\|?[ \t]*:?-+:?[ \t]*(\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$')
+
+blocks = {'address', 'article', 'aside', 'blockquote', 'center', 'details',
+	  'div', 'dl', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5',
+	  'h6', 'header', 'hr', 'nav', 'ol', 'p', 'pre', 'section', 'table',
+	  'ul'}
+
+def indent (line):
+	return len (line) - len (line.lstrip (' '))
+
+def expand (line):
+	head = line[:len (line) - len (line.lstrip (' \t'))]
+
+	return head.expandtabs (4) + line[len (head):]
+
+def dedent (line, n):
+	return line[min (n, indent (line)):]
+
+def blank (line):
+	return not line.strip ()
+
+def escape (s):
+	return html.escape (s, quote = False)
+
+def slug (text):
+	s = re.sub (r'[^\w\s-]', '', text.lower ())
+
+	return re.sub (r'[\s]+', '-', s.strip ()) or 'section'
+
+def plain (s):
+	return html.unescape (re.sub (r'<[^>]*>', '', s))
+
+def local (url):
+	return not re.match (r'^([a-z][a-z0-9+.-]*:|#|/)', url, re.I)
+
+#
+# Inlines are rendered in two passes: code spans, tags, links and images
+# are cut out as placeholders first, then the rest is escaped and marked
+# up for emphasis, and placeholders are put back.
+#
+INLINE = re.compile (r'''
+	\\(?P<esc>[!-/:-@\[-`{-~])
+	| (?P<tick>`+)(?P<code>.+?)(?<!`)(?P=tick)(?!`)
+	| <(?P<auto>https?://[^\s<>]+)>
+	| (?P<tag></?[a-zA-Z][a-zA-Z0-9-]*(?:\s+[^<>]*?)?/?>|<!--.*?-->)
+	| (?P<img>!)?\[(?P<text>(?:[^\[\]\\]|\\.|\[[^\[\]]*\])*)\]
+	  \(\s*<?(?P<url>[^\s()<>]*(?:\([^\s()]*\)[^\s()<>]*)*)>?
+	  (?:\s+(?P<q>["'])(?P<title>.*?)(?P=q))?\s*\)
+	| \[\^(?P<note>[^\]\s]+)\]
+	| (?P<amp>&(?:\#[0-9]+|\#[xX][0-9a-fA-F]+|[a-zA-Z][a-zA-Z0-9]*);)
+	| (?P<br>(?:\ {2,}|\\)\n)
+''', re.X | re.S)
+
+EMPHASIS = [
+	(re.compile (r'\*\*(?=\S)(.+?)(?<=\S)\*\*', re.S),		r'<strong>\1</strong>'),
+	(re.compile (r'(?<!\w)__(?=\S)(.+?)(?<=\S)__(?!\w)', re.S),	r'<strong>\1</strong>'),
+	(re.compile (r'\*(?=[^\s*])(.+?)(?<=[^\s*])\*', re.S),		r'<em>\1</em>'),
+	(re.compile (r'(?<!\w)_(?=[^\s_])(.+?)(?<=[^\s_])_(?!\w)', re.S),	r'<em>\1</em>'),
+]
+
+class Renderer:
+	def __init__ (self):
+		self.ids      = set ()
+		self.headings = []
+		self.refs     = []
+		self.notes    = {}		# name -> rendered text
+		self.order    = []		# footnote names in order of reference
+
+	def link (self, url):
+		if not local (url):
+			return url
+
+		path, hash, frag = url.partition ('#')
+
+		if path:
+			self.refs.append (path)
+
+		if path.endswith ('.md'):
+			path = path[:-3] + '.html'
+
+		return path + hash + frag
+
+	def note (self, name):
+		if name in self.order:
+			n = self.order.index (name) + 1
+			return f'<sup><a href="#fn-{name}">{n}</a></sup>'
+
+		self.order.append (name)
+		n = len (self.order)
+
+		return f'<sup id="fnref-{name}"><a href="#fn-{name}">{n}</a></sup>'
+
+	def inline (self, text):
+		saved = []
+
+		def keep (s):
+			saved.append (s)
+			return f'\0{len (saved) - 1}\0'
+
+		def sub (m):
+			if m['esc'] is not None:
+				return keep (escape (m['esc']))
+
+			if m['code'] is not None:
+				code = m['code']
+
+				if code.startswith (' ') and code.endswith (' ') and code.strip ():
+					code = code[1:-1]
+
+				return keep (f'<code>{escape (code)}</code>')
+
+			if m['auto'] is not None:
+				url = escape (m['auto'])
+				return keep (f'<a href="{url}">{url}</a>')
+
+			if m['tag'] is not None:
+				return keep (m['tag'])
+
+			if m['url'] is not None:
+				url   = html.escape (self.link (m['url']))
+				title = '' if m['title'] is None else \
+					f' title="{html.escape (m["title"])}"'
+
+				if m['img']:
+					alt = html.escape (plain (self.inline (m['text'])))
+					return keep (f'<img src="{url}" alt="{alt}"{title}>')
+
+				return keep (f'<a href="{url}"{title}>{self.inline (m["text"])}</a>')
+
+			if m['note'] is not None:
+				return keep (self.note (m['note']))
+
+			if m['amp'] is not None:
+				return keep (m['amp'])
+
+			return keep ('<br>\n')
+
+		s = escape (INLINE.sub (sub, text))
+
+		for pattern, repl in EMPHASIS:
+			s = pattern.sub (repl, s)
+
+		while '\0' in s:
+			s = re.sub (r'\0(\d+)\0', lambda m: saved[int (m[1])], s)
+
+		return s
+
+	def heading (self, level, text, line):
+		body = self.inline (text)
+		name = base = slug (plain (body))
+		i    = 1
+
+		while name in self.ids:
+			name = f'{base}-{i}'
+			i   += 1
+
+		self.ids.add (name)
+		self.headings.append ((level, name, plain (body), line))
+
+		return f'<h{level} id="{name}">{body}</h{level}>'
+
+	def table (self, rows, delim):
+		def cells (row):
+			row = row.strip ()
+
+			if row.startswith ('|'):
+				row = row[1:]
+
+			if row.endswith ('|') and not row.endswith ('\\|'):
+				row = row[:-1]
+
+			return [o.strip () for o in re.split (r'(?<!\\)\|', row)]
+
+		aligns = []
+
+		for o in cells (delim):
+			left, right = o.startswith (':'), o.endswith (':')
+			aligns.append ('center' if left and right else
+				       'right' if right else 'left' if left else None)
+
+		def tr (row, tag):
+			o = []
+
+			for i, cell in enumerate (cells (row)[:len (aligns)]):
+				align = f' style="text-align: {aligns[i]}"' if aligns[i] else ''
+				o.append (f'<{tag}{align}>{self.inline (cell)}</{tag}>')
+
+			return '<tr>' + ''.join (o) + '</tr>'
+
+		head = tr (rows[0], 'th')
+		body = '\n'.join (tr (row, 'td') for row in rows[1:])
+
+		return f'<table>\n<thead>\n{head}\n</thead>\n<tbody>\n{body}\n</tbody>\n</table>' \
+			if body else f'<table>\n<thead>\n{head}\n</thead>\n</table>'
+
+	#
+	# Does the line start a block that ends a paragraph?
+	#
+	def breaks (self, lines, i):
+		line = lines[i]
+
+		if FENCE.match (line) or HEADING.match (line) or RULE.match (line):
+			return True
+
+		if line.lstrip ().startswith ('>') or BULLET.match (line):
+			return True
+
+		m = ORDERED.match (line)
+
+		if m and m[2] == '1':
+			return True
+
+		m = HTML.match (line)
+
+		if m and m[1].lower () in blocks:
+			return True
+
+		return line.lstrip ().startswith ('|') and i + 1 < len (lines) and \
+		       DELIM.match (lines[i + 1]) is not None
+
+	def list (self, lines, i, first_line):
+		first = BULLET.match (lines[i]) or ORDERED.match (lines[i])
+		kind  = BULLET if first.re is BULLET else ORDERED
+		base  = indent (lines[i])
+		items, loose = [], False
+
+		while i < len (lines):
+			m = kind.match (lines[i])
+
+			if not m or indent (lines[i]) != base or \
+			   (kind is BULLET and m[2] != first[2]):
+				break
+
+			width = m.end () if m[m.lastindex] else m.end () + 1
+			start = i
+			item  = [lines[i][m.end ():]]
+			i += 1
+
+			while i < len (lines):
+				line = lines[i]
+
+				if blank (line):
+					if i + 1 < len (lines) and indent (lines[i + 1]) >= width:
+						item.append ('')
+						i += 1
+						continue
+
+					break
+
+				if indent (line) >= width:
+					item.append (dedent (line, width))
+				elif blank (item[-1]) or self.breaks (lines, i) or \
+				     BULLET.match (line) or ORDERED.match (line):
+					break
+				else:
+					item.append (line)	# lazy continuation
+
+				i += 1
+
+			items.append ((start, item))
+
+			if i < len (lines) and blank (lines[i]):
+				j = i
+
+				while j < len (lines) and blank (lines[j]):
+					j += 1
+
+				m = kind.match (lines[j]) if j < len (lines) else None
+
+				if m and indent (lines[j]) == base:
+					loose = True
+					i = j
+
+			loose = loose or '' in item
+
+		o = []
+
+		for start, item in items:
+			body = self.blocks (item, first_line + start)
+
+			if not loose:
+				body = re.sub (r'^<p>(.*?)</p>', r'\1', body, count = 1, flags = re.S)
+
+			o.append (f'<li>{body}</li>')
+
+		if kind is BULLET:
+			return '<ul>\n' + '\n'.join (o) + '\n</ul>', i
+
+		start = int (first[2])
+		start = '' if start == 1 else f' start="{start}"'
+
+		return f'<ol{start}>\n' + '\n'.join (o) + '\n</ol>', i
+
+	#
+	# Raw HTML block ends at a blank line, or where the element ends for
+	# elements that may hold blank lines (pre and nested tables).
+	#
+	def raw (self, lines, i, tag):
+		opened = re.compile (rf'<{tag}(?=[\s/>])', re.I)
+		closed = re.compile (rf'</{tag}\s*>', re.I)
+		depth, o = 0, []
+
+		while i < len (lines):
+			line = lines[i]
+
+			if depth <= 0 and o and blank (line):
+				break
+
+			depth += len (opened.findall (line)) - len (closed.findall (line))
+			o.append (line)
+			i += 1
+
+			if depth <= 0 and closed.search (line):
+				break
+
+		# escaped angle brackets are text even here
+		block = '\n'.join (o).replace ('\\<', '&lt;').replace ('\\>', '&gt;')
+
+		return block, i
+
+	#
+	# Renders lines, the first of them is line first_line of the source
+	#
+	def blocks (self, lines, first_line = 1):
+		o, i = [], 0
+
+		while i < len (lines):
+			line = lines[i]
+
+			if blank (line):
+				i += 1
+				continue
+
+			m = FENCE.match (line)
+
+			if m:
+				fence, lang, code = m[1], m[2], []
+				i += 1
+
+				while i < len (lines) and not lines[i].strip ().startswith (fence):
+					code.append (lines[i])
+					i += 1
+
+				i += 1
+				lang = f' class="language-{lang}"' if lang else ''
+				o.append (f'<pre><code{lang}>' + escape ('\n'.join (code)) +
+					  '</code></pre>')
+				continue
+
+			m = HEADING.match (line)
+
+			if m:
+				o.append (self.heading (len (m[1]), m[2] or '', first_line + i))
+				i += 1
+				continue
+
+			if RULE.match (line):
+				o.append ('<hr>')
+				i += 1
+				continue
+
+			if expand (line).startswith ('    '):
+				code = []
+
+				while i < len (lines) and (blank (lines[i]) or
+							   expand (lines[i]).startswith ('    ')):
+					code.append (lines[i])
+					i += 1
+
+				while code and blank (code[-1]):
+					code.pop ()
+
+				code = [o[1:] if o.startswith ('\t') else dedent (o, 4) for o in code]
+				o.append ('<pre><code>' + escape ('\n'.join (code)) + '</code></pre>')
+				continue
+
+			if line.lstrip ().startswith ('>'):
+				quote, start = [], i
+
+				while i < len (lines) and not blank (lines[i]):
+					quote.append (re.sub (r'^ {0,3}> ?', '', lines[i]))
+					i += 1
+
+				o.append ('<blockquote>\n' + self.blocks (quote, first_line + start) +
+					  '\n</blockquote>')
+				continue
+
+			m = NOTE.match (line)
+
+			if m:
+				name, text = m[1], [m[2]]
+				i += 1
+
+				while i < len (lines) and not blank (lines[i]) and \
+				      not NOTE.match (lines[i]):
+					text.append (lines[i].strip ())
+					i += 1
+
+				self.notes[name] = self.inline ('\n'.join (text))
+				continue
+
+			m = HTML.match (line)
+
+			if m and m[1].lower () in blocks:
+				block, i = self.raw (lines, i, m[1])
+				o.append (block)
+				continue
+
+			if line.lstrip ().startswith ('|') and i + 1 < len (lines) and \
+			   DELIM.match (lines[i + 1]):
+				rows, delim = [line], lines[i + 1]
+				i += 2
+
+				while i < len (lines) and lines[i].lstrip ().startswith ('|'):
+					rows.append (lines[i])
+					i += 1
+
+				o.append (self.table (rows, delim))
+				continue
+
+			if BULLET.match (line) or ORDERED.match (line):
+				block, i = self.list (lines, i, first_line)
+				o.append (block)
+				continue
+
+			para = [line.lstrip ()]
+			i += 1
+
+			while i < len (lines) and not blank (lines[i]) and \
+			      not self.breaks (lines, i):
+				para.append (lines[i].lstrip ())
+				i += 1
+
+			text = '\n'.join (para).rstrip ()
+
+			# caption of the next table or figure
+			if text.startswith (': '):
+				o.append ('<p class="caption">' + self.inline (text[2:]) + '</p>')
+			else:
+				o.append ('<p>' + self.inline (text) + '</p>')
+
+		return '\n'.join (o)
+
+	def footnotes (self):
+		if not self.order:
+			return ''
+
+		o = []
+
+		for name in self.order:
+			text = self.notes.get (name, '')
+			o.append (f'<li id="fn-{name}">{text} '
+				  f'<a href="#fnref-{name}">↩</a></li>')
+
+		return '<section class="footnotes">\n<ol>\n' + '\n'.join (o) + \
+		       '\n</ol>\n</section>'
+
+def render (text):
+	r     = Renderer ()
+	body  = r.blocks (text.split ('\n'))
+	notes = r.footnotes ()
+	title = r.headings[0][2] if r.headings else None
+
+	return Page (body + ('\n' + notes if notes else '') + '\n', title,
+		     r.headings, sorted (set (r.refs)))
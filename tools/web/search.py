@@ -0,0 +1,383 @@
+#
+# Full-Text Search: prebuilt inverted index of all books by sections
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Pages are split into sections at headings, as rendered, thus hits link to
+# the same ids the site uses. Words are case folded and stemmed (Russian or
+# English by script, see stem.py); words with digits are part names and are
+# kept whole, with Cyrillic letters that look like Latin ones folded to them.
+#
+# Index file is mapped into memory as it is, nothing is loaded up front:
+#
+#	header		magic, version, digest of the page list, counts,
+#			offsets of the tables below
+#	sections	path, id and title (as strings), line and word count
+#	terms		term (as string), section count, offsets of postings
+#	strings		UTF-8 strings the tables above point to
+#	postings	per term, sections as (section delta, count, bytes of
+#			positions) and, apart, positions as deltas, all in
+#			varints
+#
+# Terms are sorted by their UTF-8 bytes and looked up by binary search. The
+# positions of a section are decoded only to match a phrase.
+#
+
+import argparse, hashlib, html, math, mmap, os, re, struct, sys, time
+
+from . import build, markdown, stem
+
+magic   = b'DDSI'
+version = 3
+
+HEADER  = struct.Struct ('<4sI32s7I')
+SECTION = struct.Struct ('<8I')
+TERM    = struct.Struct ('<6I')
+
+WORD	= re.compile (r'[^\W_]+')
+HEAD	= re.compile (r'<h([1-6]) id="([^"]*)">')
+TAG	= re.compile (r'<[^>]*>')
+
+LOOKALIKE = str.maketrans ('авекмнорстух', 'abekmhopctyx')
+
+def terms (text):
+	for w in WORD.findall (text.casefold ()):
+		yield stem.stem (w) if w.isalpha () else w.translate (LOOKALIKE)
+
+#
+# Sections of a page as (id, title, line, words), text before the first
+# heading is a section with an empty id and no title.
+#
+def sections (text):
+	page  = markdown.render (text)
+	parts = HEAD.split (page.html)
+	o     = []
+
+	def words (s):
+		return list (terms (html.unescape (TAG.sub (' ', s))))
+
+	if parts[0].strip ():
+		o.append (('', '', 1, words (parts[0])))
+
+	for i, (level, id, title, line) in enumerate (page.headings):
+		o.append ((id, title, line, words (parts[3 * i + 3])))
+
+	return o
+
+def varint (n, out):
+	while n >= 0x80:
+		out.append (n & 0x7f | 0x80)
+		n >>= 7
+
+	out.append (n)
+
+def varints (data, start, end):
+	o, n, shift = [], 0, 0
+
+	for i in range (start, end):
+		b = data[i]
+		n |= (b & 0x7f) << shift
+
+		if b & 0x80:
+			shift += 7
+		else:
+			o.append (n)
+			n, shift = 0, 0
+
+	return o
+
+# digest of the paths of indexed pages
+def listing (pages):
+	return hashlib.sha256 ('\n'.join (sorted (pages)).encode ()).digest ()
+
+class Strings:
+	def __init__ (self):
+		self.data = bytearray ()
+		self.seen = {}
+
+	def add (self, s):
+		if s not in self.seen:
+			b = s.encode ()
+			self.seen[s] = len (self.data), len (b)
+			self.data += b
+
+		return self.seen[s]
+
+#
+# Builds the index of pages given as {path: text} and writes it to path
+#
+def save (path, pages):
+	strings = Strings ()
+	table   = bytearray ()
+	index   = {}
+	total   = 0
+
+	for page in sorted (pages):
+		for id, title, line, words in sections (pages[page]):
+			sid = len (table) // SECTION.size
+
+			table += SECTION.pack (*strings.add (page), *strings.add (id),
+					       *strings.add (title), line, len (words))
+			total += len (words)
+
+			for pos, w in enumerate (words):
+				index.setdefault (w, {}).setdefault (sid, []).append (pos)
+
+	keys     = sorted (index, key = str.encode)
+	terms    = bytearray ()
+	postings = bytearray ()
+	refs     = [strings.add (term) for term in keys]
+
+	for term, ref in zip (keys, refs):
+		sects, posns, last = bytearray (), bytearray (), 0
+
+		for sid, found in sorted (index[term].items ()):
+			start, prev = len (posns), 0
+
+			for pos in found:
+				varint (pos - prev, posns)
+				prev = pos
+
+			varint (sid - last, sects)
+			varint (len (found), sects)
+			varint (len (posns) - start, sects)
+			last = sid
+
+		terms += TERM.pack (*ref, len (index[term]), len (postings),
+				    len (sects), len (postings) + len (sects))
+		postings += sects + posns
+
+	count = len (table) // SECTION.size
+	base  = HEADER.size
+	head  = HEADER.pack (magic, version, listing (pages), count, len (keys),
+			     total, base, base + len (table),
+			     base + len (table) + len (terms),
+			     base + len (table) + len (terms) + len (strings.data))
+	tmp   = path + '.tmp'
+
+	os.makedirs (os.path.dirname (path) or '.', exist_ok = True)
+
+	with open (tmp, 'wb') as f:
+		for o in [head, table, terms, strings.data, postings]:
+			f.write (o)
+
+	os.replace (tmp, path)
+	return count, len (keys)
+
+class Index:
+	def __init__ (self, path):
+		with open (path, 'rb') as f:
+			self.data = mmap.mmap (f.fileno (), 0, access = mmap.ACCESS_READ)
+
+		m, v, self.pages, self.count, self.nterms, self.total, self.sect_off, \
+		self.term_off, self.str_off, self.post_off = HEADER.unpack_from (self.data)
+
+		if m != magic or v != version:
+			self.data.close ()
+			raise ValueError (f'{path}: not a search index of version {version}')
+
+	def close (self):
+		self.data.close ()
+
+	def __enter__ (self):
+		return self
+
+	def __exit__ (self, *args):
+		self.close ()
+
+	def string (self, off, size):
+		return self.data[self.str_off + off : self.str_off + off + size].decode ()
+
+	def section (self, sid):
+		po, pl, io, il, to, tl, line, words = \
+			SECTION.unpack_from (self.data, self.sect_off + sid * SECTION.size)
+
+		return self.string (po, pl), self.string (io, il), self.string (to, tl), \
+		       line, words
+
+	#
+	# Returns term entry as (section count, postings, positions), or None
+	#
+	def lookup (self, term):
+		key    = term.encode ()
+		lo, hi = 0, self.nterms
+
+		while lo < hi:
+			mid = (lo + hi) // 2
+			off, size, df, sects, slen, posns = \
+				TERM.unpack_from (self.data, self.term_off + mid * TERM.size)
+			start = self.str_off + off
+			o     = self.data[start : start + size]
+
+			if o == key:
+				base = self.post_off
+				return df, (base + sects, base + sects + slen), base + posns
+
+			if o < key:
+				lo = mid + 1
+			else:
+				hi = mid
+
+		return None
+
+	#
+	# Returns {section: (count, start, end)}, the range of its positions
+	#
+	def postings (self, entry):
+		df, (start, end), at = entry
+		v, o, sid = varints (self.data, start, end), {}, 0
+
+		for i in range (0, len (v), 3):
+			sid += v[i]
+			o[sid] = v[i + 1], at, at + v[i + 2]
+			at  += v[i + 2]
+
+		return o
+
+	def positions (self, start, end):
+		o, pos = set (), 0
+
+		for d in varints (self.data, start, end):
+			pos += d
+			o.add (pos)
+
+		return o
+
+#
+# Query is a list of words and "quoted phrases": every one of them must be
+# in a section. Sections are ranked by BM25 of all query terms.
+#
+def parse (query):
+	o = []
+
+	for phrase, word in re.findall (r'"([^"]*)"|(\S+)', query):
+		t = list (terms (phrase or word))
+
+		if t:
+			o.append (t)
+
+	return o
+
+def search (index, query, k1 = 1.2, b = 0.75):
+	phrases = parse (query)
+	found   = {}
+
+	if not phrases:
+		return []
+
+	for t in {t for phrase in phrases for t in phrase}:
+		entry = index.lookup (t)
+
+		if entry is None:
+			return []
+
+		found[t] = entry[0], index.postings (entry)
+
+	hits = set.intersection (*(set (found[t][1]) for t in found))
+
+	for phrase in phrases:
+		if len (phrase) > 1:
+			hits = {sid for sid in hits if matches (index, found, phrase, sid)}
+
+	avg = index.total / max (index.count, 1)
+	o   = []
+
+	for sid in hits:
+		path, id, title, line, words = index.section (sid)
+		score = 0
+
+		for t, (df, post) in found.items ():
+			tf = post[sid][0]
+			idf = math.log (1 + (index.count - df + 0.5) / (df + 0.5))
+			score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * words / avg))
+
+		o.append ((score, path, line, id, title))
+
+	return sorted (o, key = lambda o: (-o[0], o[1], o[2]))
+
+def matches (index, found, phrase, sid):
+	starts = None
+
+	for i, t in enumerate (phrase):
+		count, start, end = found[t][1][sid]
+		at = {pos - i for pos in index.positions (start, end)}
+		starts = at if starts is None else starts & at
+
+		if not starts:
+			return False
+
+	return True
+
+#
+# Index is built anew if it is missing, of other version, of other set of
+# pages (one added or removed) or older than any page
+#
+def stale (path, pages):
+	try:
+		t = os.stat (path).st_mtime_ns
+
+		with open (path, 'rb') as f:
+			head = f.read (HEADER.size)
+	except FileNotFoundError:
+		return True
+
+	if len (head) < HEADER.size:
+		return True
+
+	m, v, listed = HEADER.unpack (head)[:3]
+
+	if m != magic or v != version or listed != listing (pages):
+		return True
+
+	return any (os.stat (os.path.join (build.root, page)).st_mtime_ns > t
+		    for page in pages)
+
+def parser ():
+	p = argparse.ArgumentParser (description = 'Search all books')
+
+	p.add_argument ('-i', '--index', default = os.path.join (build.root, 'site', 'search.idx'),
+			help = 'index file (default: site/search.idx)')
+	p.add_argument ('-b', '--build', action = 'store_true',
+			help = 'build the index, changed pages or not')
+	p.add_argument ('-n', '--limit', type = int, default = 20,
+			help = 'number of hits to show (default: 20)')
+	p.add_argument ('-l', '--links', action = 'store_true',
+			help = 'show hits as links to site pages')
+	p.add_argument ('-v', '--verbose', action = 'store_true',
+			help = 'show scores and query time')
+	p.add_argument ('query', nargs = '*',
+			help = 'words and "quoted phrases" to search for')
+	return p
+
+def run (args):
+	pages = build.sources ()
+
+	if args.build or stale (args.index, pages):
+		count, terms = save (args.index, {page: build.read (page) for page in pages})
+		print (f'{len (pages)} pages indexed: {count} sections, {terms} terms',
+		       file = sys.stderr)
+
+	if not args.query:
+		return 0
+
+	start = time.perf_counter ()
+
+	with Index (args.index) as index:
+		hits = search (index, ' '.join (args.query))
+
+	for score, path, line, id, title in hits[:args.limit]:
+		if args.links:
+			where = build.html_name (path) + (f'#{id}' if id else '')
+		else:
+			where = f'{path}:{line}:'
+
+		print (f'{score:6.2f} ' if args.verbose else '', where, ' ', title,
+		       sep = '')
+
+	if args.verbose:
+		print (f'{len (hits)} hits in {(time.perf_counter () - start) * 1000:.1f} ms',
+		       file = sys.stderr)
+
+	return 0 if hits else 1
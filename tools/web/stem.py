@@ -0,0 +1,295 @@
+#
+# Word Stemmers: Snowball stemmers for English (Porter2) and Russian
+#
+# Copyright (c) 2026 Alexei A. Smekalkine <ikle@ikle.ru>
+#
+# SPDX-License-Identifier: BSD-2-Clause
+#
+# Both stemmers follow the Snowball algorithms: suffixes are looked up in
+# regions R1, R2 (and RV for Russian) of a word, the longest suffix of a
+# group is taken and removed only if its condition holds. Words are to be
+# case folded already.
+#
+
+import re
+
+# English
+
+VOWELS = 'aeiouy'
+DOUBLE = ('bb', 'dd', 'ff', 'gg', 'mm', 'nn', 'pp', 'rr', 'tt')
+
+EXCEPTIONS = {
+	'skis': 'ski', 'skies': 'sky', 'dying': 'die', 'lying': 'lie',
+	'tying': 'tie', 'idly': 'idl', 'gently': 'gentl', 'ugly': 'ugli',
+	'early': 'earli', 'only': 'onli', 'singly': 'singl', 'sky': 'sky',
+	'news': 'news', 'howe': 'howe', 'atlas': 'atlas', 'cosmos': 'cosmos',
+	'bias': 'bias', 'andes': 'andes',
+}
+
+INVARIANT = {'inning', 'outing', 'canning', 'herring', 'earring', 'proceed',
+	     'exceed', 'succeed'}
+
+def region (w, vowels, start = 0):
+	for i in range (start + 1, len (w)):
+		if w[i] not in vowels and w[i - 1] in vowels:
+			return i + 1
+
+	return len (w)
+
+def short_syllable (w, i):
+	if i == 1:
+		return w[0] in VOWELS and w[1] not in VOWELS
+
+	return i >= 2 and w[i - 2] not in VOWELS and w[i - 1] in VOWELS and \
+	       w[i] not in VOWELS and w[i] not in 'wxY'
+
+def longest (w, suffixes):
+	for s in sorted (suffixes, key = len, reverse = True):
+		if w.endswith (s):
+			return s
+
+	return None
+
+def english (w):
+	if len (w) <= 2:
+		return w
+
+	if w in EXCEPTIONS:
+		return EXCEPTIONS[w]
+
+	w = w.lstrip ("'")
+	w = re.sub (r'^y', 'Y', w)
+	w = re.sub (r'([aeiouy])y', r'\1Y', w)
+
+	for prefix in ('gener', 'commun', 'arsen'):
+		if w.startswith (prefix):
+			r1 = len (prefix)
+			break
+	else:
+		r1 = region (w, VOWELS)
+
+	r2 = region (w, VOWELS, r1)
+
+	def short ():
+		return r1 >= len (w) and short_syllable (w, len (w) - 1)
+
+	# step 0
+	s = longest (w, ("'s'", "'s", "'"))
+
+	if s:
+		w = w[:-len (s)]
+
+	# step 1a
+	s = longest (w, ('sses', 'ied', 'ies', 'us', 'ss', 's'))
+
+	if s == 'sses':
+		w = w[:-2]
+	elif s in ('ied', 'ies'):
+		w = w[:-3] + ('i' if len (w) > 4 else 'ie')
+	elif s == 's':
+		if any (c in VOWELS for c in w[:-2]):
+			w = w[:-1]
+
+	if w in INVARIANT:
+		return w
+
+	# step 1b
+	s = longest (w, ('eed', 'eedly', 'ed', 'edly', 'ing', 'ingly'))
+
+	if s in ('eed', 'eedly'):
+		if len (w) - len (s) >= r1:
+			w = w[:-len (s)] + 'ee'
+	elif s:
+		stem = w[:-len (s)]
+
+		if any (c in VOWELS for c in stem):
+			w = stem
+
+			if w.endswith (('at', 'bl', 'iz')):
+				w += 'e'
+			elif w.endswith (DOUBLE):
+				w = w[:-1]
+			elif short ():
+				w += 'e'
+
+	# step 1c
+	if len (w) > 2 and w[-1] in 'yY' and w[-2] not in VOWELS:
+		w = w[:-1] + 'i'
+
+	# step 2
+	step2 = {
+		'tional': 'tion', 'enci': 'ence', 'anci': 'ance', 'abli': 'able',
+		'entli': 'ent', 'izer': 'ize', 'ization': 'ize', 'ational': 'ate',
+		'ation': 'ate', 'ator': 'ate', 'alism': 'al', 'aliti': 'al',
+		'alli': 'al', 'fulness': 'ful', 'ousli': 'ous', 'ousness': 'ous',
+		'iveness': 'ive', 'iviti': 'ive', 'biliti': 'ble', 'bli': 'ble',
+		'ogi': 'og', 'fulli': 'ful', 'lessli': 'less', 'li': '',
+	}
+
+	s = longest (w, step2)
+
+	if s and len (w) - len (s) >= r1:
+		stem = w[:-len (s)]
+
+		if s == 'ogi':
+			if stem.endswith ('l'):
+				w = stem + 'og'
+		elif s == 'li':
+			if stem and stem[-1] in 'cdeghkmnrt':
+				w = stem
+		else:
+			w = stem + step2[s]
+
+	# step 3
+	step3 = {
+		'tional': 'tion', 'ational': 'ate', 'alize': 'al', 'icate': 'ic',
+		'iciti': 'ic', 'ical': 'ic', 'ful': '', 'ness': '', 'ative': '',
+	}
+
+	s = longest (w, step3)
+
+	if s and len (w) - len (s) >= r1:
+		if s != 'ative' or len (w) - len (s) >= r2:
+			w = w[:-len (s)] + step3[s]
+
+	# step 4
+	s = longest (w, ('al', 'ance', 'ence', 'er', 'ic', 'able', 'ible', 'ant',
+			 'ement', 'ment', 'ent', 'ism', 'ate', 'iti', 'ous', 'ive',
+			 'ize', 'ion'))
+
+	if s and len (w) - len (s) >= r2:
+		if s != 'ion' or w[:-3].endswith (('s', 't')):
+			w = w[:-len (s)]
+
+	# step 5
+	if w.endswith ('e'):
+		if len (w) - 1 >= r2 or (len (w) - 1 >= r1 and
+					 not short_syllable (w, len (w) - 2)):
+			w = w[:-1]
+	elif w.endswith ('ll') and len (w) - 1 >= r2:
+		w = w[:-1]
+
+	return w.replace ('Y', 'y')
+
+# Russian
+
+RU_VOWELS = 'аеиоуыэюя'
+
+GERUND = (('в', 'вши', 'вшись'),
+	  ('ив', 'ивши', 'ившись', 'ыв', 'ывши', 'ывшись'))
+
+ADJECTIVE = ('ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем',
+	     'им', 'ым', 'ом', 'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю',
+	     'ая', 'яя', 'ою', 'ею')
+
+PARTICIPLE = (('ем', 'нн', 'вш', 'ющ', 'щ'),
+	      ('ивш', 'ывш', 'ующ'))
+
+REFLEXIVE = ('ся', 'сь')
+
+VERB = (('ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'ем', 'н', 'ло', 'но', 'ет',
+	 'ют', 'ны', 'ть', 'ешь', 'нно'),
+	('ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ей', 'уй',
+	 'ил', 'ыл', 'им', 'ым', 'ен', 'ило', 'ыло', 'ено', 'ят', 'ует', 'уют',
+	 'ит', 'ыт', 'ены', 'ить', 'ыть', 'ишь', 'ую', 'ю'))
+
+NOUN = ('а', 'ев', 'ов', 'ие', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии', 'и',
+	'ией', 'ей', 'ой', 'ий', 'й', 'иям', 'ям', 'ием', 'ем', 'ам', 'ом', 'о',
+	'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю', 'ия', 'ья', 'я')
+
+#
+# Removes the longest suffix of two groups: suffixes of the first group go
+# after 'а' or 'я' only. Returns the word left or None if nothing matched.
+#
+def among (w, groups):
+	first, second = groups
+	s = longest (w, first + second)
+
+	if s is None:
+		return None
+
+	if s in second:
+		return w[:-len (s)]
+
+	return w[:-len (s)] if w[:-len (s)].endswith (('а', 'я')) else None
+
+def remove (w, suffixes):
+	s = longest (w, suffixes)
+
+	return None if s is None else w[:-len (s)]
+
+def russian (w):
+	w  = w.replace ('ё', 'е')
+	pv = 0
+
+	while pv < len (w) and w[pv] not in RU_VOWELS:
+		pv += 1
+
+	pv = min (pv + 1, len (w))
+	r2 = region (w, RU_VOWELS, region (w, RU_VOWELS))
+
+	# all suffixes are looked up in RV
+	head, rv = w[:pv], w[pv:]
+
+	# step 1
+	o = among (rv, GERUND)
+
+	if o is not None:
+		rv = o
+	else:
+		o = remove (rv, REFLEXIVE)
+
+		if o is not None:
+			rv = o
+
+		o = remove (rv, ADJECTIVE)
+
+		if o is not None:
+			rv = among (o, PARTICIPLE)
+
+			if rv is None:
+				rv = o
+		else:
+			o = among (rv, VERB)
+
+			if o is None:
+				o = remove (rv, NOUN)
+
+			if o is not None:
+				rv = o
+
+	# step 2
+	if rv.endswith ('и'):
+		rv = rv[:-1]
+
+	# step 3
+	s = longest (rv, ('ост', 'ость'))
+
+	if s and pv + len (rv) - len (s) >= r2:
+		rv = rv[:-len (s)]
+
+	# step 4
+	s = longest (rv, ('ейш', 'ейше'))
+
+	if s:
+		rv = rv[:-len (s)]
+
+	if rv.endswith ('нн'):
+		rv = rv[:-1]
+	elif not s and rv.endswith ('ь'):
+		rv = rv[:-1]
+
+	return head + rv
+
+#
+# Words of Cyrillic letters are Russian, words of Latin letters are English,
+# anything else (numbers, part names) is left as it is.
+#
+def stem (word):
+	if re.fullmatch (r'[а-яё]+', word):
+		return russian (word)
+
+	if re.fullmatch (r'[a-z]+', word):
+		return english (word)
+
+	return word